@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Benchmarks for the table window and the game logic.
+# python bench.py                 run everything and compare against the saved baseline
+# python bench.py --save          run everything and store the results as the new baseline
+# python bench.py --headless      render without a display (pyglet headless / EGL)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+# A benchmark regresses when its median is this much slower than the baseline
+REGRESSION_THRESHOLD = 0.25
+WARMUP_FRAMES = 20
+FRAMES = 200
+
+
+def time_calls(func, repeat=50, number=200):
+    # Median and p99 seconds per call over repeat batches of number calls
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return summarize(samples)
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "median": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "samples": len(samples),
+    }
+
+
+def time_frames(window, frames=FRAMES):
+    # Frame time of a full redraw, waiting for the GPU so the work isn't just queued
+    for _ in range(WARMUP_FRAMES):
+        window.draw_frame()
+    window.ctx.finish()
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        window.draw_frame()
+        window.ctx.finish()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def finish_deal(window):
+    window.start_deal_animation()
+    while window.dealing:
+        window.on_update(1 / 60)
+
+
+def fill_hands(window, cards_per_hand):
+    game = window.game
+    for player in range(game.num_players):
+        while len(game.hands[player]) < cards_per_hand and game.deck:
+            game.move_to_hand(game.draw(), player)
+
+
+def time_each(func, state, repeat=50, number=100):
+    # Like time_calls, but every call gets its own copy of state, made before timing starts
+    pool = iter([state.copy() for _ in range(repeat * number)])
+    return time_calls(lambda: func(next(pool)), repeat, number)
+
+
+def logic_benchmarks(window):
+    import engine
+    from layout import compute_layout
+    from tween import DEAL_DURATION
+
+    results = {}
+    # Layout is only recomputed on resize, so time the computation rather than the cached read
+    results["compute_layout"] = time_calls(lambda: compute_layout(window.width, window.height, window.card_scale))
+    # Scored on the same large hands frame_benchmarks draws, not on an empty table
+    finish_deal(window)
+    fill_hands(window, 12)
+    results["get_player_score"] = time_calls(lambda: [window.get_player_score(i) for i in range(4)])
+    results["get_winner_text"] = time_calls(window.get_winner_text)
+
+    dealt = engine.Game(seed=1)
+    dealt.deal()
+    results["sabacc_shift"] = time_each(engine.Game.sabacc_shift, dealt)
+    # A deck too short for the new hands makes the shift reshuffle the discard pile under it
+    short = dealt.copy()
+    needed = sum(len(hand) for hand in short.hands)
+    while len(short.deck) >= needed:
+        short.discard_card(short.draw())
+    results["sabacc_shift_reshuffle"] = time_each(engine.Game.sabacc_shift, short)
+    snapshot = dealt.snapshot()
+    results["snapshot"] = time_calls(dealt.snapshot)
+    results["restore"] = time_calls(lambda: dealt.restore(snapshot))
+
+    # One vectorized step of a deal halfway through, some cards landed and some in the air;
+    # the clock is wound back before each step so the group never finishes
+    window.reset_deck()
+    window.start_deal_animation()
+    tweens = window.deal_tweens
+    tweens.update(DEAL_DURATION / 2)
+    middle = tweens.clock
+
+    def deal_step():
+        tweens.clock = middle
+        tweens.update(1 / 240)
+
+    results["deal_step"] = time_calls(deal_step)
+    window.reset_deck()
+    return results
+
+
+def frame_benchmarks(window):
+    results = {}
+    window.reset_deck()
+    results["frame_empty"] = time_frames(window)
+
+    finish_deal(window)
+    results["frame_dealt"] = time_frames(window)
+
+    fill_hands(window, 12)
+    results["frame_large_hands"] = time_frames(window)
+
+    window.last_dice = [3, 3]
+    window.dice_result_text = "Dice: 3, 3"
+    window.show_sabacc_shift = True
+    results["frame_dice_overlay"] = time_frames(window)
+    window.reset_deck()
+    return results
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    # Returns {name: ratio} for every benchmark whose median got slower than allowed
+    regressions = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base and base["median"] > 0:
+            ratio = result["median"] / base["median"]
+            if ratio > 1 + threshold:
+                regressions[name] = ratio
+    return regressions
+
+
+def print_results(results, baseline=None, regressions=()):
+    print(f"{'Benchmark':<22} {'median':>10} {'p99':>10} {'baseline':>10}")
+    for name, result in results.items():
+        base = baseline.get(name) if baseline else None
+        base_text = format_time(base["median"]) if base else "-"
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<22} {format_time(result['median']):>10} {format_time(result['p99']):>10} {base_text:>10}{flag}")
+
+
+def format_time(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Sabacc table.")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--no-frames", action="store_true", help="skip the on_draw frame timings")
+    args = parser.parse_args()
+
+    if args.headless:
+        import pyglet
+        pyglet.options["headless"] = True
+    import main as table
+
+    window = table.DeckTestWindow()
+    window.set_visible(False)
+    window.setup()
+
+    results = logic_benchmarks(window)
+    if not args.no_frames:
+        results.update(frame_benchmarks(window))
+    window.close()
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold) if baseline else {}
+    print_results(results, baseline, regressions)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
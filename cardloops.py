@@ -1,22 +1,151 @@
+import functools
 import random
+import sys
 
-#Sabacc cards are 1-10 both positive and negative
-#not ideal way to model I'm sure
-postive_cards = [i for i in range(1,11)]*3
-negative_cards = [-i for i in range(1,11)]*3
+import numpy as np
 
-deck = postive_cards + negative_cards
-random.shuffle(deck)
+import engine
+import handrank
 
-#need to create classes
-player1 = [deck.pop(), deck.pop()]
-player2 = [deck.pop(), deck.pop()]
-players = [sum(player1), sum(player2)]
+# Card arrays for the vectorized simulator, indexed by engine card id
+CARD_VALUE = np.array(engine.CARD_VALUE, dtype=np.int8)
+CARD_SYLOP = np.array(engine.CARD_SYLOP, dtype=np.int16)
+DECK_SIZE = engine.DECK_SIZE
 
-print("Player1 cards: ", player1, ",The hand total is ", sum(player1))
-print("Player2 cards: ", player2, ",The hand total is ", sum(player2))
+PURE_SABACC_KEY = handrank.PURE_SABACC_KEY
+RANK_KEYS = np.array(handrank.RANK_KEYS, dtype=np.int16)
 
-#closest to absolute zero wins
-winner = min(players,key=abs)
+_SORTED_DECK = np.arange(DECK_SIZE, dtype=np.int8)
 
-print(winner)
+
+def deal_hands(rng, n_games, n_players, cards_per_hand):
+    # Partial Fisher-Yates over every game at once: only the dealt cards get shuffled into place,
+    # which is exact and much cheaper than sorting a full (n_games, 62) random matrix.
+    # Decks are stored one game per column so every step touches contiguous rows.
+    n_dealt = n_players * cards_per_hand
+    decks = np.repeat(_SORTED_DECK[:, None], n_games, axis=1)
+    flat_decks = decks.reshape(-1)
+    columns = np.arange(n_games, dtype=np.int32)
+    for j in range(n_dealt):
+        picks = rng.integers(j, DECK_SIZE, n_games, dtype=np.int32) * n_games + columns
+        top = decks[j].copy()
+        decks[j] = flat_decks[picks]
+        flat_decks[picks] = top
+    # Dealt round-robin like the table: card j goes to player j % n_players.
+    # Returns card ids shaped (cards_per_hand, n_players, n_games).
+    return decks[:n_dealt].reshape(cards_per_hand, n_players, n_games)
+
+
+@functools.lru_cache(maxsize=None)
+def _hand_tables(cards_per_hand):
+    # Each card gets a code so that the sum of a hand's codes identifies its total and sylop count;
+    # the hand's total and rank key (from the shared handrank table) are then a single lookup
+    span = 20 * cards_per_hand + 1
+    codes = CARD_VALUE.astype(np.int16) + 10 + span * CARD_SYLOP
+    sums = np.arange(span * (cards_per_hand + 1))
+    totals = sums % span - 10 * cards_per_hand
+    sylops = np.minimum(sums // span, handrank.MAX_SYLOPS)
+    # Sums no real hand reaches can decode to totals past the rank table; their keys are never read
+    clipped = np.clip(totals, -handrank.MAX_TOTAL, handrank.MAX_TOTAL)
+    keys = RANK_KEYS[handrank.key_index(clipped, sylops, cards_per_hand)]
+    return codes, totals.astype(np.int16), keys
+
+
+def hand_keys(dealt):
+    # dealt is (cards_per_hand, n_players, n_games) card ids; returns (totals, keys) per hand
+    codes, totals, keys = _hand_tables(dealt.shape[0])
+    sums = codes[dealt[0]]
+    for cards in dealt[1:]:
+        sums = sums + codes[cards]
+    return totals[sums], keys[sums]
+
+
+def simulate(n_games, n_players=2, cards_per_hand=2, seed=None, batch_size=65536):
+    # Deals and scores a batch of games at once, using the same rules as engine.find_winners
+    if n_players * cards_per_hand > DECK_SIZE:
+        raise ValueError("Not enough cards to deal that many hands")
+    if n_games < 1:
+        raise ValueError("Simulate at least one game")
+    if n_players < 1 or cards_per_hand < 1:
+        raise ValueError("Deal at least one card to at least one player")
+    rng = np.random.default_rng(seed)
+    max_total = 10 * cards_per_hand
+    wins = np.zeros(n_players, dtype=np.int64)
+    ties = np.zeros(n_players, dtype=np.int64)
+    score_counts = np.zeros(2 * max_total + 1, dtype=np.int64)
+    winning_score_counts = np.zeros(2 * max_total + 1, dtype=np.int64)
+    pure_sabacc = 0
+    sabacc = 0
+
+    remaining = n_games
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        remaining -= n
+        totals, keys = hand_keys(deal_hands(rng, n, n_players, cards_per_hand))
+        winners = keys == keys.max(axis=0)
+        sole = winners.sum(axis=0) == 1
+        wins += (winners & sole).sum(axis=1)
+        ties += (winners & ~sole).sum(axis=1)
+        score_counts += np.bincount((totals + max_total).ravel(), minlength=score_counts.size)
+        winning_score_counts += np.bincount(totals[winners] + max_total, minlength=score_counts.size)
+        pure_sabacc += int(np.count_nonzero(keys == PURE_SABACC_KEY))
+        sabacc += int(np.count_nonzero((keys > 0) & (keys < PURE_SABACC_KEY)))
+
+    n_hands = n_games * n_players
+    scores = range(-max_total, max_total + 1)
+    return {
+        "games": n_games,
+        "players": n_players,
+        "wins": wins,
+        "ties": ties,
+        "win_rate": wins / n_games,
+        "tie_rate": ties / n_games,
+        "score_distribution": {s: int(c) / n_hands for s, c in zip(scores, score_counts) if c},
+        "winning_score_distribution": {s: int(c) / n_games for s, c in zip(scores, winning_score_counts) if c},
+        "pure_sabacc_rate": pure_sabacc / n_hands,
+        "sabacc_rate": sabacc / n_hands,
+    }
+
+
+def print_results(results):
+    print(f"{results['games']} games, {results['players']} players")
+    print("Player  Win rate  Tie rate")
+    for i in range(results["players"]):
+        print(f"{i + 1:>6}  {results['win_rate'][i]:>8.4f}  {results['tie_rate'][i]:>8.4f}")
+    print(f"Pure Sabacc hands: {results['pure_sabacc_rate']:.5f}  Sabacc hands: {results['sabacc_rate']:.5f}")
+    print("Score  Hands    Winning hands")
+    winning = results["winning_score_distribution"]
+    for score, rate in results["score_distribution"].items():
+        print(f"{score:>+5d}  {rate:.5f}  {winning.get(score, 0):.5f}")
+
+
+def play_hand():
+    #Sabacc cards are 1-10 both positive and negative
+    #not ideal way to model I'm sure
+    postive_cards = [i for i in range(1,11)]*3
+    negative_cards = [-i for i in range(1,11)]*3
+
+    deck = postive_cards + negative_cards
+    random.shuffle(deck)
+
+    #need to create classes
+    player1 = [deck.pop(), deck.pop()]
+    player2 = [deck.pop(), deck.pop()]
+    players = [sum(player1), sum(player2)]
+
+    print("Player1 cards: ", player1, ",The hand total is ", sum(player1))
+    print("Player2 cards: ", player2, ",The hand total is ", sum(player2))
+
+    #closest to absolute zero wins
+    winner = min(players,key=abs)
+
+    print(winner)
+
+
+if __name__ == "__main__":
+    # python cardloops.py [n_games] [n_players] runs the batch simulator instead of a single hand
+    if len(sys.argv) > 1:
+        n_players = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+        print_results(simulate(int(sys.argv[1]), n_players))
+    else:
+        play_hand()
@@ -0,0 +1,52 @@
+import arcade
+
+from layout import NAME_BG_H, NAME_BG_W, ROUND_BOX_H, ROUND_BOX_W, SCORE_BG_H, SCORE_BG_W
+
+# Table chrome (drop boxes, label backgrounds, pile outline, buttons, round box) only depends on
+# the layout and a couple of state flags, so it is prebuilt into shape batches that draw in one call.
+
+PLAYER_BOX_COLOR = (*arcade.color.LIGHT_GREEN, 40)
+LABEL_BG_COLOR = (30, 60, 30, 180)
+ROUND_BOX_COLOR = (30, 30, 30, 200)
+
+
+def build_under_cards(pos):
+    # Drawn before the cards: expanded transparent player boxes and the discard pile outline
+    shapes = arcade.ShapeElementList()
+    for x, y in pos.player_pile_positions:
+        shapes.append(arcade.create_rectangle_filled(
+            x, y, pos.player_box_width, pos.player_box_height, PLAYER_BOX_COLOR
+        ))
+    shapes.append(arcade.create_rectangle_outline(
+        pos.discard_pile_x, pos.discard_pile_y, pos.pile_width, pos.pile_height, arcade.color.LIGHT_GRAY, 3
+    ))
+    return shapes
+
+
+def build_over_cards(pos, dealing, show_winner_button):
+    # Drawn after the cards: name and score backgrounds, buttons and the round box
+    shapes = arcade.ShapeElementList()
+    for x, y in pos.name_bg_positions:
+        shapes.append(arcade.create_rectangle_filled(x, y, NAME_BG_W, NAME_BG_H, LABEL_BG_COLOR))
+    for x, y in pos.score_bg_positions:
+        shapes.append(arcade.create_rectangle_filled(x, y, SCORE_BG_W, SCORE_BG_H, LABEL_BG_COLOR))
+    deal_color = arcade.color.GRAY if dealing else arcade.color.DARK_BLUE
+    shapes.append(arcade.create_rectangle_filled(
+        pos.button_x, pos.button_y, pos.button_width, pos.button_height, deal_color
+    ))
+    shapes.append(arcade.create_rectangle_filled(
+        pos.reset_x, pos.reset_y, pos.reset_w, pos.reset_h, arcade.color.DARK_RED
+    ))
+    shapes.append(arcade.create_rectangle_filled(
+        pos.dice_button_x, pos.dice_button_y, pos.dice_button_w, pos.dice_button_h, arcade.color.DARK_GREEN
+    ))
+    shapes.append(arcade.create_rectangle_filled(
+        pos.round_box_x, pos.round_box_y, ROUND_BOX_W, ROUND_BOX_H, ROUND_BOX_COLOR
+    ))
+    if show_winner_button:
+        shapes.append(arcade.create_rectangle_filled(
+            pos.show_winner_button_x, pos.show_winner_button_y,
+            pos.show_winner_button_w, pos.show_winner_button_h,
+            arcade.color.DARK_ORANGE
+        ))
+    return shapes
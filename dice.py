@@ -0,0 +1,60 @@
+import random
+
+# Dice for the Sabacc Shift. roll_dice is the pure roll used by the rules; DiceRoll is the
+# on-screen tumble, a keyframe timeline fixed when the roll starts and played back from
+# delta_time, which reports the result through a callback once both dice have stopped.
+
+FACES = 6
+ROLL_DURATION = (1.0, 1.7)
+STOP_JITTER = 0.2
+# Faces flicker quickly at first and slow down towards the stop
+FIRST_INTERVAL = 0.04
+INTERVAL_GROWTH = 0.18
+
+
+def roll_dice(rng=random, count=2):
+    return tuple(rng.randint(1, FACES) for _ in range(count))
+
+
+def build_timeline(result, rng=random):
+    # One list of (time, face) keyframes per die, ending on the rolled face
+    duration = rng.uniform(*ROLL_DURATION)
+    timelines = []
+    for final in result:
+        stop = duration + rng.uniform(0, STOP_JITTER)
+        keyframes = []
+        t = 0.0
+        while t < stop:
+            keyframes.append((t, rng.randint(1, FACES)))
+            t += FIRST_INTERVAL + (t / stop) * INTERVAL_GROWTH * rng.uniform(0.9, 1.1)
+        keyframes.append((stop, final))
+        timelines.append(keyframes)
+    return timelines
+
+
+class DiceRoll:
+    def __init__(self, result, rng=random, on_complete=None):
+        self.result = tuple(result)
+        self.timelines = build_timeline(self.result, rng)
+        self.end_time = max(keyframes[-1][0] for keyframes in self.timelines)
+        self.on_complete = on_complete
+        self.elapsed = 0.0
+        self.cursors = [0] * len(self.result)
+        self.faces = [keyframes[0][1] for keyframes in self.timelines]
+        self.finished = False
+
+    def update(self, delta_time):
+        if self.finished:
+            return
+        self.elapsed += delta_time
+        for i, keyframes in enumerate(self.timelines):
+            cursor = self.cursors[i]
+            while cursor + 1 < len(keyframes) and keyframes[cursor + 1][0] <= self.elapsed:
+                cursor += 1
+            self.cursors[i] = cursor
+            self.faces[i] = keyframes[cursor][1]
+        if self.elapsed >= self.end_time:
+            self.finished = True
+            self.faces = list(self.result)
+            if self.on_complete is not None:
+                self.on_complete(*self.result)
@@ -0,0 +1,515 @@
+import random
+import struct
+
+import dice
+import handrank
+from handrank import PURE_SABACC, SABACC
+
+# Headless Sabacc rules: deck, hands, discard pile, rounds and turn actions.
+# Nothing in here knows about arcade, so games can be simulated without a window.
+
+# Sabacc cards are 1-10 both positive and negative in three suits, plus two sylops (0)
+CARD_VALUES = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10,
+               -1, -2, -3, -4, -5, -6, -7, -8, -9, -10]
+CARD_SUITS = ["Circle", "Square", "Triangle"]
+SYLOP_SUIT = "Sylop"
+SYLOP_COUNT = 2
+
+NUM_PLAYERS = 4
+MAX_ROUNDS = 3
+
+# Turn actions for bots, played as (kind, card) pairs; card is None for STAND, GAIN and KEEP.
+# A turn is STAND, DISCARD a card, SWAP a card for the top of the discard pile,
+# or GAIN the top of the deck followed by KEEP or DISCARD.
+STAND, GAIN, KEEP, DISCARD, SWAP = range(5)
+
+# Zone codes for Game.location, which holds the zone of every card; the hand of player p is
+# HAND_ZONE + p. Moves keep it up to date, so finding a card never scans the zones.
+DECK_ZONE, TABLE_ZONE, DISCARD_ZONE, HAND_ZONE = range(4)
+
+# Events a Game records into its log, see eventlog.py. Each is the kind plus up to three
+# byte arguments: the low bytes of the seed for RESET and SHIFT, the card, the player, or
+# the two dice. The rest of a seed goes in EV_SEED events just before the RESET or SHIFT.
+(EV_RESET, EV_DEAL, EV_DRAW, EV_TAKE_DISCARD, EV_CANCEL_SWAP, EV_PICK_UP,
+ EV_MOVE, EV_DISCARD, EV_DICE, EV_SHIFT, EV_ROUND, EV_SEED) = range(12)
+# A logged game reseeds each shuffle from its RNG with a seed this size, so the log can replay
+# it; unlogged games never reseed and keep the RNG's full state from game to game
+SEED_BITS = 72
+
+# Game.snapshot layout: this header (format, players, max rounds, round, turn, swap candidate,
+# previous discard top, last discarded, gained card, the two dice), one size byte per zone,
+# then the deck, table, discard and hand card ids. Missing cards are NO_CARD, missing dice 0.
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_HEADER = struct.Struct("11B")
+NO_CARD = 255
+
+
+# A card is a single small integer id: suit * 20 + value index for the suited cards,
+# then the sylops. Zones store ids in bytearrays, so game states are a few hundred bytes
+# and copy, hash and shuffle cheaply. Everything else about a card is a table lookup.
+SYLOP_SUIT_INDEX = len(CARD_SUITS)
+DECK_SIZE = len(CARD_SUITS) * len(CARD_VALUES) + SYLOP_COUNT
+CARD_SUIT_INDEX = tuple(min(card // len(CARD_VALUES), SYLOP_SUIT_INDEX) for card in range(DECK_SIZE))
+CARD_VALUE = tuple(
+    0 if suit == SYLOP_SUIT_INDEX else CARD_VALUES[card % len(CARD_VALUES)]
+    for card, suit in enumerate(CARD_SUIT_INDEX)
+)
+CARD_SUIT = tuple((CARD_SUITS + [SYLOP_SUIT])[suit] for suit in CARD_SUIT_INDEX)
+CARD_SYLOP = tuple(suit == SYLOP_SUIT_INDEX for suit in CARD_SUIT_INDEX)
+
+
+def card_name(card):
+    # Matches the card image names, e.g. "+7 Circle", "-3 Square", "0 Sylop"
+    value = CARD_VALUE[card]
+    if value == 0:
+        return f"0 {CARD_SUIT[card]}"
+    return f"{value:+d} {CARD_SUIT[card]}"
+
+
+def new_deck():
+    return bytearray(range(DECK_SIZE))
+
+
+class Hand:
+    # A player's cards plus a running total and sylop count, kept up to date in O(1)
+    # on every add and remove so scoring never has to walk the cards
+    __slots__ = ("cards", "total", "sylops")
+
+    def __init__(self, cards=()):
+        self.cards = bytearray()
+        self.total = 0
+        self.sylops = 0
+        for card in cards:
+            self.append(card)
+
+    def append(self, card):
+        self.cards.append(card)
+        self.total += CARD_VALUE[card]
+        self.sylops += CARD_SYLOP[card]
+
+    def extend(self, cards):
+        self.cards += cards
+        self.total += sum(map(CARD_VALUE.__getitem__, cards))
+        self.sylops += sum(map(CARD_SYLOP.__getitem__, cards))
+
+    def _forget(self, card):
+        self.total -= CARD_VALUE[card]
+        self.sylops -= CARD_SYLOP[card]
+
+    def copy(self):
+        hand = Hand.__new__(Hand)
+        hand.cards = self.cards[:]
+        hand.total = self.total
+        hand.sylops = self.sylops
+        return hand
+
+    def remove(self, card):
+        self.cards.remove(card)
+        self._forget(card)
+
+    def pop(self, index=-1):
+        card = self.cards.pop(index)
+        self._forget(card)
+        return card
+
+    def clear(self):
+        self.cards.clear()
+        self.total = 0
+        self.sylops = 0
+
+    def index(self, card):
+        return self.cards.index(card)
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __reversed__(self):
+        return reversed(self.cards)
+
+    def __getitem__(self, index):
+        return self.cards[index]
+
+    def __contains__(self, card):
+        return card in self.cards
+
+    @property
+    def score(self):
+        # "Pure Sabacc" for two sylops, "Sabacc" for a non-empty hand totalling 0, else the total
+        if self.sylops == 2:
+            return PURE_SABACC
+        elif self.total == 0 and self.cards:
+            return SABACC
+        else:
+            return self.total
+
+    @property
+    def rank_key(self):
+        return handrank.rank_key(self.total, self.sylops, len(self.cards))
+
+    def __repr__(self):
+        return f"Hand({[card_name(card) for card in self.cards]!r})"
+
+
+def as_hand(cards):
+    return cards if isinstance(cards, Hand) else Hand(cards)
+
+
+def find_winners(hands):
+    # Returns (kind, players) where kind is PURE_SABACC, SABACC or None for closest-to-zero.
+    # Pure Sabacc beats everything, then Sabacc with the fewest cards,
+    # then the total closest to zero with positive totals winning ties.
+    best, players = handrank.best_of([as_hand(hand).rank_key for hand in hands])
+    return handrank.key_kind(best), players
+
+
+def winner_text(hands):
+    kind, players = find_winners(hands)
+    names = ", ".join(str(p + 1) for p in players)
+    if kind is not None:
+        if len(players) == 1:
+            return f"Player {players[0] + 1} wins with {kind}!"
+        return f"Players {names} tie with {kind}!"
+    scores = [as_hand(hands[p]).total for p in players]
+    if len(players) == 1:
+        return f"Player {players[0] + 1} wins with {scores[0]:+d}!"
+    return f"Players {names} tie with {', '.join(str(s) for s in scores)}!"
+
+
+def _seed_bytes(seed):
+    return seed & 0xFF, seed >> 8 & 0xFF, seed >> 16 & 0xFF
+
+
+def _card_byte(card):
+    return NO_CARD if card is None else card
+
+
+def _byte_card(byte):
+    return None if byte == NO_CARD else byte
+
+
+class Game:
+    # Zones: deck (top card is the last item), table (cards drawn but not yet placed),
+    # one hand per player and the discard pile (top card is the last item).
+    # version goes up on every state change so views can tell when to re-layout.
+    # With a log (an eventlog.EventLog) every state change is also recorded as an event.
+    def __init__(self, num_players=NUM_PLAYERS, max_rounds=MAX_ROUNDS, seed=None, log=None):
+        self.num_players = num_players
+        self.max_rounds = max_rounds
+        self.log = log
+        self.rng = random.Random(seed)
+        self.cards = new_deck()
+        self.deck = bytearray()
+        self.table = bytearray()
+        self.hands = [Hand() for _ in range(num_players)]
+        self.discard = bytearray()
+        self.location = bytearray(DECK_SIZE)
+        self.version = 0
+        self.reset()
+
+    def _record(self, kind, a=0, b=0, c=0):
+        if self.log is not None:
+            self.log.append(kind, a, b, c)
+
+    def _reseed(self, seed):
+        if seed is None:
+            if self.log is None:
+                return 0
+            seed = self.rng.getrandbits(SEED_BITS)
+        self.rng.seed(seed)
+        return seed
+
+    def _record_seeded(self, kind, seed):
+        # High bytes first in EV_SEED events, the low three with the event itself
+        for shift in range(SEED_BITS - 24, 0, -24):
+            if seed >> shift:
+                self._record(EV_SEED, *_seed_bytes(seed >> shift))
+        self._record(kind, *_seed_bytes(seed))
+
+    def reset(self, seed=None):
+        self._record_seeded(EV_RESET, self._reseed(seed))
+        self.deck = self.cards[:]
+        self.rng.shuffle(self.deck)
+        self.table = bytearray()
+        self.hands = [Hand() for _ in range(self.num_players)]
+        self.discard = bytearray()
+        self.location = bytearray(DECK_SIZE)
+        self.swap_candidate = False
+        self.last_discarded = None
+        self.previous_discard_top = None
+        self.last_dice = None
+        self.round = 1
+        self.turn = 0
+        self.gained = None
+        self.version += 1
+
+    def snapshot(self):
+        # The whole table state in a few dozen bytes; restore() reads it back
+        die1, die2 = self.last_dice or (0, 0)
+        zones = [self.deck, self.table, self.discard] + [hand.cards for hand in self.hands]
+        header = SNAPSHOT_HEADER.pack(
+            SNAPSHOT_FORMAT, self.num_players, self.max_rounds, self.round, self.turn, self.swap_candidate,
+            _card_byte(self.previous_discard_top), _card_byte(self.last_discarded), _card_byte(self.gained),
+            die1, die2,
+        )
+        return b"".join([header, bytes(map(len, zones))] + zones)
+
+    def restore(self, data):
+        (snapshot_format, num_players, self.max_rounds, self.round, self.turn, swap_candidate,
+         previous_discard_top, last_discarded, gained, die1, die2) = SNAPSHOT_HEADER.unpack_from(data)
+        if snapshot_format != SNAPSHOT_FORMAT:
+            raise ValueError(f"unsupported snapshot format {snapshot_format}")
+        offset = SNAPSHOT_HEADER.size
+        sizes = data[offset:offset + num_players + 3]
+        offset += len(sizes)
+        zones = []
+        for size in sizes:
+            zones.append(data[offset:offset + size])
+            offset += size
+        self.num_players = num_players
+        self.deck = bytearray(zones[0])
+        self.table = bytearray(zones[1])
+        self.discard = bytearray(zones[2])
+        self.hands = [Hand(cards) for cards in zones[3:]]
+        self.reindex()
+        self.swap_candidate = bool(swap_candidate)
+        self.previous_discard_top = _byte_card(previous_discard_top)
+        self.last_discarded = _byte_card(last_discarded)
+        self.gained = _byte_card(gained)
+        self.last_dice = (die1, die2) if die1 else None
+        self.version += 1
+
+    @classmethod
+    def from_snapshot(cls, data, seed=None, log=None):
+        game = cls.__new__(cls)
+        game.rng = random.Random(seed)
+        game.cards = new_deck()
+        game.log = log
+        game.version = 0
+        game.restore(data)
+        return game
+
+    def copy(self):
+        # Cheap independent copy for search and simulation: zones are bytearrays
+        game = Game.__new__(Game)
+        game.__dict__.update(self.__dict__)
+        game.rng = random.Random()
+        game.rng.setstate(self.rng.getstate())
+        game.log = None
+        game.deck = self.deck[:]
+        game.table = self.table[:]
+        game.hands = [hand.copy() for hand in self.hands]
+        game.discard = self.discard[:]
+        game.location = self.location[:]
+        return game
+
+    def reindex(self):
+        # Rebuilds location after the zones were replaced wholesale
+        location = self.location = bytearray(DECK_SIZE)
+        for card in self.table:
+            location[card] = TABLE_ZONE
+        for card in self.discard:
+            location[card] = DISCARD_ZONE
+        for player, hand in enumerate(self.hands):
+            zone = HAND_ZONE + player
+            for card in hand.cards:
+                location[card] = zone
+
+    def zone(self, code):
+        if code >= HAND_ZONE:
+            return self.hands[code - HAND_ZONE]
+        return (self.deck, self.table, self.discard)[code]
+
+    def in_zone(self, card, code):
+        return card is not None and self.location[card] == code
+
+    @property
+    def is_over(self):
+        return self.round > self.max_rounds
+
+    def _remove(self, card):
+        self.version += 1
+        self.zone(self.location[card]).remove(card)
+
+    def deal(self):
+        # Two cards each at the start of a game, otherwise one card each.
+        # Returns the dealt (card, player) pairs in dealing order.
+        rounds = 2 if all(len(hand) == 0 for hand in self.hands) else 1
+        self._record(EV_DEAL)
+        self.version += 1
+        dealt = []
+        for _ in range(rounds):
+            for player in range(self.num_players):
+                if self.deck:
+                    card = self.deck.pop()
+                    self.hands[player].append(card)
+                    self.location[card] = HAND_ZONE + player
+                    dealt.append((card, player))
+        return dealt
+
+    def draw(self):
+        # Gain: take the top card of the deck onto the table
+        self._record(EV_DRAW)
+        self._clear_swap()
+        if not self.deck:
+            return None
+        card = self.deck.pop()
+        self.table.append(card)
+        self.location[card] = TABLE_ZONE
+        return card
+
+    def take_discard(self):
+        # Swap: after a discard, take back the card that was on top before it
+        card = self.previous_discard_top
+        self._record(EV_TAKE_DISCARD)
+        self._clear_swap()
+        if not self.in_zone(card, DISCARD_ZONE):
+            return None
+        self.discard.remove(card)
+        self.table.append(card)
+        self.location[card] = TABLE_ZONE
+        return card
+
+    def cancel_swap(self):
+        self._record(EV_CANCEL_SWAP)
+        self._clear_swap()
+
+    def _clear_swap(self):
+        self.swap_candidate = False
+        self.previous_discard_top = None
+        self.version += 1
+
+    def pick_up(self, card):
+        # Lift a card out of a hand onto the table
+        self._record(EV_PICK_UP, card)
+        self._remove(card)
+        self.table.append(card)
+        self.location[card] = TABLE_ZONE
+
+    def move_to_hand(self, card, player):
+        self._record(EV_MOVE, card, player)
+        self._remove(card)
+        self.hands[player].append(card)
+        self.location[card] = HAND_ZONE + player
+
+    def discard_card(self, card):
+        self._record(EV_DISCARD, card)
+        self.previous_discard_top = self.discard[-1] if self.discard else None
+        self._remove(card)
+        self.discard.append(card)
+        self.location[card] = DISCARD_ZONE
+        self.swap_candidate = len(self.discard) > 1
+        self.last_discarded = card
+
+    def roll_dice(self):
+        return dice.roll_dice(self.rng)
+
+    def resolve_roll(self, die1, die2):
+        # Doubles trigger a Sabacc Shift. Every roll ends the round.
+        # Returns the (card, player) pairs dealt by the shift, if any.
+        self.set_dice(die1, die2)
+        dealt = self.sabacc_shift() if die1 == die2 else []
+        self.advance_round()
+        return dealt
+
+    def set_dice(self, die1, die2):
+        self._record(EV_DICE, die1, die2)
+        self.last_dice = (die1, die2)
+        self._clear_swap()
+
+    def advance_round(self):
+        if self.round <= self.max_rounds:
+            self._record(EV_ROUND)
+            self.round += 1
+            self.version += 1
+
+    def sabacc_shift(self, seed=None):
+        # Every hand is discarded and replaced with the same number of new cards, in one pass:
+        # if the deck is too short the discard pile is shuffled in under it once, then each
+        # player in turn takes their new hand off the top. Returns the dealt (card, player) pairs.
+        location = self.location
+        hands = self.hands
+        sizes = [len(hand) for hand in hands]
+        needed = sum(sizes)
+        # Only a reshuffle needs the RNG, and so a seed; the event carries 0 otherwise
+        recycle = len(self.deck) < needed
+        self._record_seeded(EV_SHIFT, self._reseed(seed) if recycle else 0)
+        self.version += 1
+        for hand in hands:
+            self.discard += hand.cards
+            hand.clear()
+        if recycle:
+            recycled = self.discard[:]
+            self.discard.clear()
+            self.rng.shuffle(recycled)
+            self.deck[:0] = recycled
+            for card in recycled:
+                location[card] = DECK_ZONE
+        else:
+            for card in self.discard[-needed:]:
+                location[card] = DISCARD_ZONE
+        # The top of the deck is its end, so the new cards come off in reverse
+        top = len(self.deck) - needed
+        drawn = self.deck[top:][::-1]
+        del self.deck[top:]
+        dealt = []
+        start = 0
+        for player, size in enumerate(sizes):
+            cards = drawn[start:start + size]
+            start += size
+            hands[player].extend(cards)
+            zone = HAND_ZONE + player
+            for card in cards:
+                location[card] = zone
+                dealt.append((card, player))
+        return dealt
+
+    def legal_actions(self):
+        # A player always keeps at least one card, so an empty hand can't score 0
+        hand = self.hands[self.turn]
+        discards = [(DISCARD, card) for card in hand] if len(hand) > 1 else []
+        if self.gained is not None:
+            return [(KEEP, None)] + discards
+        actions = [(STAND, None)]
+        if self.deck:
+            actions.append((GAIN, None))
+        actions += discards
+        if self.discard:
+            actions += [(SWAP, card) for card in hand]
+        return actions
+
+    def play(self, action):
+        # Applies one action for the player whose turn it is. After the last player
+        # the dice are rolled, which may shift every hand and ends the round.
+        if self.act(action):
+            self.end_turn()
+
+    def act(self, action):
+        # Applies an action without ending the turn; returns True once the turn is over
+        kind, card = action
+        player = self.turn
+        if kind == GAIN:
+            self.gained = self.draw()
+            self.move_to_hand(self.gained, player)
+            return False
+        if kind == DISCARD:
+            self.discard_card(card)
+        elif kind == SWAP:
+            self.move_to_hand(self.discard[-1], player)
+            self.discard_card(card)
+        self.gained = None
+        return True
+
+    def end_turn(self):
+        self.turn += 1
+        if self.turn == self.num_players:
+            self.turn = 0
+            self.resolve_roll(*self.roll_dice())
+
+    def score(self, player):
+        return self.hands[player].score
+
+    def winner_text(self):
+        return winner_text(self.hands)
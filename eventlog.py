@@ -0,0 +1,162 @@
+import argparse
+import struct
+import time
+
+import engine
+
+# Append-only binary log of game events. Every event is EVENT_SIZE bytes: the kind (engine.EV_*)
+# and three byte arguments, so a game of a few hundred events takes about a kilobyte and any
+# event can be found by offset. Replaying the events into a fresh engine.Game rebuilds the
+# exact table state at that point; shuffles are replayed from the seeds the events carry,
+# a seed too wide for one event being spread over the EV_SEED events just before it.
+# A log of a restored table starts from the engine snapshot it was restored from.
+#
+# python eventlog.py sabacc_events.log [--at N]   replay a saved log and print the table
+
+EVENT_SIZE = 4
+MAGIC = b"SABACCEV3\n"
+LOG_FILE = "sabacc_events.log"
+
+
+def _seed(a, b, c):
+    return a | b << 8 | c << 16
+
+
+# Event kind -> how to apply it to a Game; seeded events also get the high part of the seed
+SEEDED = {
+    engine.EV_RESET: lambda game, seed: game.reset(seed),
+    engine.EV_SHIFT: lambda game, seed: game.sabacc_shift(seed),
+}
+REPLAY = {
+    engine.EV_DEAL: lambda game, a, b, c: game.deal(),
+    engine.EV_DRAW: lambda game, a, b, c: game.draw(),
+    engine.EV_TAKE_DISCARD: lambda game, a, b, c: game.take_discard(),
+    engine.EV_CANCEL_SWAP: lambda game, a, b, c: game.cancel_swap(),
+    engine.EV_PICK_UP: lambda game, a, b, c: game.pick_up(a),
+    engine.EV_MOVE: lambda game, a, b, c: game.move_to_hand(a, b),
+    engine.EV_DISCARD: lambda game, a, b, c: game.discard_card(a),
+    engine.EV_DICE: lambda game, a, b, c: game.set_dice(a, b),
+    engine.EV_ROUND: lambda game, a, b, c: game.advance_round(),
+}
+
+EVENT_NAMES = {
+    engine.EV_RESET: "reset", engine.EV_DEAL: "deal", engine.EV_DRAW: "draw",
+    engine.EV_TAKE_DISCARD: "take discard", engine.EV_CANCEL_SWAP: "cancel swap",
+    engine.EV_PICK_UP: "pick up", engine.EV_MOVE: "move", engine.EV_DISCARD: "discard",
+    engine.EV_DICE: "dice", engine.EV_SHIFT: "shift", engine.EV_ROUND: "round", engine.EV_SEED: "seed",
+}
+
+
+class EventLog:
+    def __init__(self, data=b"", base=b""):
+        self.data = bytearray(data)
+        self.base = bytes(base)
+
+    def append(self, kind, a=0, b=0, c=0):
+        self.data += bytes((kind, a, b, c))
+
+    def __len__(self):
+        return len(self.data) // EVENT_SIZE
+
+    def __iter__(self):
+        return struct.iter_unpack("4B", self.data)
+
+    def event(self, index):
+        offset = index * EVENT_SIZE
+        return tuple(self.data[offset:offset + EVENT_SIZE])
+
+    def game_start(self, stop):
+        # Events up to and including the last reset before event stop, as a reset clears the
+        # whole table; 0 when there is none and the game starts from the base snapshot
+        kind = engine.EV_RESET
+        data = self.data
+        for index in range(min(stop, len(self)) - 1, -1, -1):
+            if data[index * EVENT_SIZE] == kind:
+                return index + 1
+        return 0
+
+    def seeding(self, position):
+        # True when position stops among the EV_SEED events of a seed, before its event
+        return 0 < position < len(self) and self.data[(position - 1) * EVENT_SIZE] == engine.EV_SEED
+
+    def save(self, path=LOG_FILE):
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(self.base).to_bytes(2, "little"))
+            f.write(self.base)
+            f.write(self.data)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a Sabacc event log")
+            base = f.read(int.from_bytes(f.read(2), "little"))
+            data = f.read()
+        if len(data) % EVENT_SIZE:
+            # A write cut short by a crash leaves a partial event at the end
+            data = data[:len(data) - len(data) % EVENT_SIZE]
+        return cls(data, base)
+
+
+def replay(log, stop=None, num_players=engine.NUM_PLAYERS):
+    # The game state after the first stop events (all of them by default), rebuilt
+    # from the last reset before that point without rendering anything
+    if stop is None:
+        stop = len(log)
+    start = log.game_start(stop)
+    if start:
+        game = engine.Game(num_players)
+        start -= 1
+        while log.seeding(start):
+            start -= 1
+    elif log.base:
+        game = engine.Game.from_snapshot(log.base)
+    else:
+        game = engine.Game(num_players)
+    data = memoryview(log.data)[start * EVENT_SIZE:stop * EVENT_SIZE]
+    high = 0
+    for kind, a, b, c in struct.iter_unpack("4B", data):
+        if kind == engine.EV_SEED:
+            high = high << 24 | _seed(a, b, c)
+        elif kind in SEEDED:
+            SEEDED[kind](game, high << 24 | _seed(a, b, c))
+            high = 0
+        else:
+            REPLAY[kind](game, a, b, c)
+    return game
+
+
+def describe(game):
+    lines = [f"Round {min(game.round, game.max_rounds)}, dice {game.last_dice}, {len(game.deck)} cards in the deck"]
+    for player, hand in enumerate(game.hands):
+        cards = ", ".join(engine.card_name(card) for card in hand)
+        lines.append(f"Player {player + 1}: {hand.score} [{cards}]")
+    lines.append("Table: " + ", ".join(engine.card_name(card) for card in game.table))
+    lines.append("Discard: " + ", ".join(engine.card_name(card) for card in game.discard))
+    if game.is_over:
+        lines.append(game.winner_text())
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Sabacc event log.")
+    parser.add_argument("path", nargs="?", default=LOG_FILE)
+    parser.add_argument("--at", type=int, default=None, help="replay only the first N events")
+    args = parser.parse_args()
+    log = EventLog.load(args.path)
+    start = time.perf_counter()
+    game = replay(log, args.at)
+    elapsed = time.perf_counter() - start
+    stop = len(log) if args.at is None else min(args.at, len(log))
+    print(f"{len(log)} events ({len(log.data)} bytes); state after event {stop}, replayed in {elapsed * 1e3:.2f}ms")
+    if stop:
+        kind, a, b, c = log.event(stop - 1)
+        print(f"Last event: {EVENT_NAMES[kind]} {a} {b} {c}")
+    for line in describe(game):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Integer rank keys for Sabacc hands, higher is better. Only a hand's total, sylop count and
+# card count matter, so the key of every possible composition is computed once up front and
+# winner detection becomes a max over keys. Shared by the engine, the GUI and the simulators.
+
+PURE_SABACC = "Pure Sabacc"
+SABACC = "Sabacc"
+
+MAX_CARDS = 62  # The whole deck in one hand
+MAX_TOTAL = 165  # Every positive card in one hand
+MAX_SYLOPS = 2
+TOTAL_SPAN = 2 * MAX_TOTAL + 1
+
+# Pure Sabacc beats everything, then Sabacc with fewer cards ranking higher,
+# then the total closest to zero with positive totals winning ties
+PURE_SABACC_KEY = MAX_CARDS + 1
+SABACC_KEY = MAX_CARDS  # Key of a one-card Sabacc; every extra card ranks one lower
+
+
+def compute_key(total, sylops, count):
+    if sylops == 2:
+        return PURE_SABACC_KEY
+    if total == 0 and count:
+        return SABACC_KEY + 1 - count
+    return -(2 * abs(total) + (total < 0)) - 1
+
+
+def key_index(total, sylops, count):
+    return (count * (MAX_SYLOPS + 1) + sylops) * TOTAL_SPAN + total + MAX_TOTAL
+
+
+RANK_KEYS = [
+    compute_key(total, sylops, count)
+    for count in range(MAX_CARDS + 1)
+    for sylops in range(MAX_SYLOPS + 1)
+    for total in range(-MAX_TOTAL, MAX_TOTAL + 1)
+]
+
+
+def rank_key(total, sylops, count):
+    return RANK_KEYS[key_index(total, sylops, count)]
+
+
+def key_kind(key):
+    # PURE_SABACC, SABACC or None for a closest-to-zero hand
+    if key == PURE_SABACC_KEY:
+        return PURE_SABACC
+    if key > 0:
+        return SABACC
+    return None
+
+
+def best_of(keys):
+    # Returns (best key, indices holding it); several indices mean a tie
+    best = max(keys)
+    return best, [i for i, key in enumerate(keys) if key == best]
@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+# Hit-testing for the table. Buttons, drop zones and cards are stored in a uniform grid
+# so a click or a drop only looks at the few entries whose cells it touches.
+
+CELL_SIZE = 128
+
+
+class Rect(namedtuple("Rect", "left bottom right top")):
+    __slots__ = ()
+
+    @classmethod
+    def from_center(cls, x, y, width, height):
+        return cls(x - width // 2, y - height // 2, x + width // 2, y + height // 2)
+
+    def contains(self, x, y):
+        return self.left < x < self.right and self.bottom < y < self.top
+
+    def overlap_area(self, other):
+        width = min(self.right, other.right) - max(self.left, other.left)
+        height = min(self.top, other.top) - max(self.bottom, other.bottom)
+        if width <= 0 or height <= 0:
+            return 0
+        return width * height
+
+
+# target is a button/zone name, a ("hand", player) drop zone or a card sprite;
+# zone says where a card currently lives ("table" or ("hand", player))
+Hit = namedtuple("Hit", "order target rect zone")
+
+
+class SpatialIndex:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.count = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.count = 0
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (
+            range(int(rect.left // size), int(rect.right // size) + 1),
+            range(int(rect.bottom // size), int(rect.top // size) + 1),
+        )
+
+    def insert(self, target, rect, zone=None):
+        # Entries inserted first win when several overlap a query
+        hit = Hit(self.count, target, rect, zone)
+        self.count += 1
+        columns, rows = self._cell_range(rect)
+        for cx in columns:
+            for cy in rows:
+                self.cells.setdefault((cx, cy), []).append(hit)
+        return hit
+
+    def query_point(self, x, y):
+        size = self.cell_size
+        cell = self.cells.get((int(x // size), int(y // size)), ())
+        return sorted((hit for hit in cell if hit.rect.contains(x, y)), key=lambda hit: hit.order)
+
+    def query_rect(self, rect):
+        found = {}
+        columns, rows = self._cell_range(rect)
+        for cx in columns:
+            for cy in rows:
+                for hit in self.cells.get((cx, cy), ()):
+                    if hit.order not in found and hit.rect.overlap_area(rect) > 0:
+                        found[hit.order] = hit
+        return [found[order] for order in sorted(found)]
+
+
+def sprite_rect(sprite):
+    return Rect(sprite.left, sprite.bottom, sprite.right, sprite.top)
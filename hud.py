@@ -0,0 +1,66 @@
+import arcade
+
+# Retained-mode HUD labels. arcade.draw_text shares one pyglet label between every string
+# drawn with the same style, so alternating strings re-layout their glyphs on every call.
+# Each HudText owns its label and only touches it when something actually changed.
+
+
+class HudText:
+    def __init__(self, text="", color=arcade.color.WHITE, size=12, **style):
+        self.label = arcade.Text(text, 0, 0, color, size, **style)
+        self.text = text
+        self.position = (0, 0)
+        self.color = color
+        self.size = size
+
+    def update(self, text=None, x=None, y=None, color=None, size=None):
+        if text is not None and text != self.text:
+            self.text = text
+            self.label.text = text
+        if x is not None and y is not None and (x, y) != self.position:
+            self.position = (x, y)
+            self.label.position = self.position
+        if color is not None and color != self.color:
+            self.color = color
+            self.label.color = color
+        if size is not None and size != self.size:
+            self.size = size
+            self.label.font_size = size
+
+    def draw(self, text=None, x=None, y=None, color=None):
+        self.update(text, x, y, color)
+        if self.text:
+            self.label.draw()
+
+
+class Hud:
+    # Every label the table shows, created once with its style
+    def __init__(self, num_players):
+        self.discard = HudText("Discard", arcade.color.LIGHT_GRAY, 16)
+        self.player_names = [
+            HudText(f"Player {i+1}", arcade.color.LIGHT_GREEN, 16) for i in range(num_players)
+        ]
+        self.scores = [
+            HudText("", arcade.color.YELLOW_ORANGE, 22, width=190, align="center", bold=True, font_name="Arial")
+            for _ in range(num_players)
+        ]
+        self.cards_left = HudText("", arcade.color.WHITE, 20)
+        self.help = HudText("Click the pile to draw a card. Drag to move.", arcade.color.AQUA, 18)
+        self.deal = HudText("Deal Cards", arcade.color.WHITE, 28)
+        self.dealing = HudText("Dealing...", arcade.color.YELLOW, 22)
+        self.reset = HudText("Reset Deck", arcade.color.WHITE, 28)
+        self.roll_dice = HudText("Roll Dice", arcade.color.WHITE, 28)
+        self.dice_result = HudText("", arcade.color.YELLOW, 22)
+        self.ai_status = HudText("", arcade.color.AQUA, 22)
+        self.sabacc_shift = HudText(
+            "Sabacc Shift", arcade.color.GOLD, 32, width=300, align="center", bold=True, font_name="Arial"
+        )
+        self.resizer_title = HudText("Card Size", arcade.color.WHITE, 24)
+        self.resizer_value = HudText("", arcade.color.WHITE, 20)
+        self.resizer_hint = HudText("Press I to close", arcade.color.LIGHT_GRAY, 16)
+        self.round = HudText("", arcade.color.YELLOW, 26, width=160, align="center", bold=True)
+        self.show_winner = HudText("Show Winner", arcade.color.WHITE, 28)
+        self.winner = HudText("", arcade.color.GOLD, 38, width=640, align="center", bold=True)
+        self.profiler = HudText(
+            "", arcade.color.WHITE, 12, width=340, multiline=True, anchor_y="top", font_name=("Courier New", "DejaVu Sans Mono")
+        )
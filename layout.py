@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+# Table geometry for one window size. Computed once per resize (or card scale change)
+# and shared by rendering and hit-testing instead of being rebuilt every frame.
+
+MARGIN = 60
+SHOW_WINNER_BUTTON_W = 220
+SHOW_WINNER_BUTTON_H = 60
+NAME_BG_W, NAME_BG_H = 110, 32
+# Wide enough for long negative numbers
+SCORE_BG_W, SCORE_BG_H = 210, 44
+ROUND_BOX_W, ROUND_BOX_H = 180, 44
+# Dice overlay in the middle of the table
+DICE_SIZE = 96
+DICE_BOX_W, DICE_BOX_H = DICE_SIZE * 2 + 40, DICE_SIZE + 40
+
+
+@dataclass(slots=True, frozen=True)
+class Layout:
+    width: int
+    height: int
+    card_scale: float
+    pile_width: int
+    pile_height: int
+    player_box_width: int
+    player_box_height: int
+    button_x: int
+    button_y: int
+    button_width: int
+    button_height: int
+    draw_pile_x: int
+    draw_pile_y: int
+    discard_pile_x: int
+    discard_pile_y: int
+    dice_button_x: int
+    dice_button_y: int
+    dice_button_w: int
+    dice_button_h: int
+    reset_x: int
+    reset_y: int
+    reset_w: int
+    reset_h: int
+    player_pile_positions: Tuple[Tuple[int, int], ...]
+    show_winner_button_x: int
+    show_winner_button_y: int
+    show_winner_button_w: int
+    show_winner_button_h: int
+    name_bg_positions: Tuple[Tuple[int, int], ...]
+    score_bg_positions: Tuple[Tuple[int, int], ...]
+    round_box_x: int
+    round_box_y: int
+
+
+def compute_layout(width, height, card_scale):
+    pile_width = int(width * 0.08)
+    pile_height = int(height * 0.175)
+    pile_width = max(70, min(pile_width, 140))
+    pile_height = max(100, min(pile_height, 200))
+
+    # --- Expand player box width for easier dropping ---
+    player_box_extra = int(width * 0.15)  # Add 15% of width to each player box
+    player_box_width = pile_width + player_box_extra
+    player_box_height = pile_height + 30  # Slightly taller too
+
+    button_width = int(width * 0.18)
+    button_height = int(height * 0.075)
+    button_width = max(120, min(button_width, 300))
+    button_height = max(40, min(button_height, 80))
+
+    dice_button_w = int(width * 0.14)
+    dice_button_h = button_height
+    dice_button_x = width - MARGIN - dice_button_w // 2
+    dice_button_y = height - MARGIN - dice_button_h // 2
+
+    reset_w = button_width
+    reset_h = button_height
+
+    button_x = width - MARGIN - button_width // 2
+    button_y = MARGIN + button_height // 2
+    draw_pile_x = button_x
+    draw_pile_y = button_y + button_height // 2 + pile_height // 2 + 10
+
+    discard_pile_x = draw_pile_x - pile_width - 40
+    discard_pile_y = draw_pile_y
+
+    reset_x = MARGIN + reset_w // 2
+    reset_y = MARGIN + reset_h // 2
+
+    player_pile_positions = (
+        (width // 2, height - MARGIN - pile_height // 2),  # Top
+        (width - MARGIN - pile_width // 2, height // 2),   # Right
+        (width // 2, MARGIN + pile_height // 2 + button_height + 40),  # Bottom
+        (MARGIN + pile_width // 2, height // 2),                # Left
+    )
+
+    return Layout(
+        width=width,
+        height=height,
+        card_scale=card_scale,
+        pile_width=pile_width,
+        pile_height=pile_height,
+        player_box_width=player_box_width,
+        player_box_height=player_box_height,
+        button_x=button_x,
+        button_y=button_y,
+        button_width=button_width,
+        button_height=button_height,
+        draw_pile_x=draw_pile_x,
+        draw_pile_y=draw_pile_y,
+        discard_pile_x=discard_pile_x,
+        discard_pile_y=discard_pile_y,
+        dice_button_x=dice_button_x,
+        dice_button_y=dice_button_y,
+        dice_button_w=dice_button_w,
+        dice_button_h=dice_button_h,
+        reset_x=reset_x,
+        reset_y=reset_y,
+        reset_w=reset_w,
+        reset_h=reset_h,
+        player_pile_positions=player_pile_positions,
+        show_winner_button_x=width - MARGIN - dice_button_w // 2,
+        show_winner_button_y=dice_button_y - dice_button_h // 2 - 40 - SHOW_WINNER_BUTTON_H // 2,
+        show_winner_button_w=SHOW_WINNER_BUTTON_W,
+        show_winner_button_h=SHOW_WINNER_BUTTON_H,
+        name_bg_positions=tuple((x, y + pile_height // 2 + 26) for x, y in player_pile_positions),
+        score_bg_positions=tuple((x, y - pile_height // 2 - 18) for x, y in player_pile_positions),
+        # Top left, low enough not to cover "Cards left in pile"
+        round_box_x=30 + ROUND_BOX_W // 2,
+        round_box_y=height - 130 - ROUND_BOX_H // 2,
+    )
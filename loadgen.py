@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import random
+import time
+
+import protocol
+
+# Load generator for server.py: every simulated player holds its own connection, sends one
+# action at a time and waits for the server to answer it before sending the next.
+# python loadgen.py --tables 1000 --players 2 --duration 20
+
+CONNECT_CONCURRENCY = 100  # Connections opened at once while ramping up
+
+
+class Player:
+    def __init__(self, table, rng):
+        self.table = table
+        self.rng = rng
+        self.you = None
+        self.state = {}
+        self.latencies = []
+        self.received = 0
+        self.errors = 0
+
+    def cards(self, zone):
+        return bytes.fromhex(self.state.get(zone, ""))
+
+    def choose(self):
+        # A random action that is legal in the last state seen
+        state = self.state
+        rng = self.rng
+        if state.get("winner") or len(self.cards("deck")) < 8:
+            return {"op": "reset"}
+        hands = [self.cards(f"hand{player}") for player in range(4)]
+        if not any(hands):
+            return {"op": "deal"}
+        table = self.cards("table")
+        if table:
+            return {"op": "move", "card": rng.choice(table), "player": rng.randrange(4)}
+        choice = rng.random()
+        held = [hand for hand in hands if len(hand) > 1]
+        if choice < 0.4:
+            return {"op": "gain"}
+        if choice < 0.7 and held:
+            return {"op": "discard", "card": rng.choice(rng.choice(held))}
+        if choice < 0.8 and state.get("swap", [False])[0]:
+            return {"op": "swap"}
+        if choice < 0.9:
+            return {"op": "deal"}
+        return {"op": "roll"}
+
+    async def run(self, host, port, connect_limit, stop_at):
+        async with connect_limit:
+            reader, writer = await asyncio.open_connection(host, port)
+        writer.write(protocol.encode({"op": "join", "table": self.table}))
+        await self.answer(reader)
+        try:
+            while time.perf_counter() < stop_at:
+                writer.write(protocol.encode(self.choose()))
+                start = time.perf_counter()
+                await writer.drain()
+                await self.answer(reader)
+                self.latencies.append(time.perf_counter() - start)
+        finally:
+            writer.close()
+
+    async def answer(self, reader):
+        # Reads until the reply to this player's last message, applying deltas from the others
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("server closed the connection")
+            self.received += len(line)
+            message = protocol.decode(line)
+            op = message["op"]
+            if op == "state":
+                self.you = message["you"]
+                self.state = message["state"]
+                return
+            if op == "error":
+                self.errors += 1
+                return
+            self.state.update(message["changes"])
+            if message["by"] == self.you:
+                return
+
+
+async def run_load(host, port, tables, players, duration, seed):
+    rng = random.Random(seed)
+    connect_limit = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    load = [
+        Player(f"load-{table}", random.Random(rng.getrandbits(32)))
+        for table in range(tables) for _ in range(players)
+    ]
+    start = time.perf_counter()
+    stop_at = start + duration
+    results = await asyncio.gather(
+        *(player.run(host, port, connect_limit, stop_at) for player in load), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    failed = [result for result in results if isinstance(result, Exception)]
+    return load, failed, elapsed
+
+
+def print_report(load, failed, elapsed):
+    latencies = sorted(latency for player in load for latency in player.latencies)
+    actions = len(latencies)
+    received = sum(player.received for player in load)
+    errors = sum(player.errors for player in load)
+    print(f"{len(load)} players, {len(failed)} failed" + (f" (first: {failed[0]!r})" if failed else ""))
+    if not actions:
+        return
+    print(f"{actions} actions in {elapsed:.1f}s: {actions / elapsed:.0f} actions/s, {errors} refused")
+    print(
+        f"latency p50 {latencies[actions // 2] * 1e3:.2f}ms, "
+        f"p99 {latencies[min(actions - 1, int(actions * 0.99))] * 1e3:.2f}ms, "
+        f"max {latencies[-1] * 1e3:.2f}ms"
+    )
+    print(f"{received / actions:.0f} bytes received per action")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate load against a Sabacc table server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=protocol.DEFAULT_PORT)
+    parser.add_argument("--tables", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=1, help="connections per table")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print_report(*asyncio.run(run_load(args.host, args.port, args.tables, args.players, args.duration, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
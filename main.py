@@ -1,61 +1,117 @@
 import arcade
+import argparse
 import os
 import random
-import math
 import time
-from dice import roll_dice  # Import the minimal dice roller
+import concurrent.futures
+import multiprocessing
+import chrome
+import dice
+import engine
+import eventlog
+import hud
+import mcts
+import netclient
+import protocol
+import strategies
+import textures
+from hittest import Rect, SpatialIndex, sprite_rect
+from layout import DICE_BOX_H, DICE_BOX_W, DICE_SIZE, ROUND_BOX_W, SCORE_BG_W, compute_layout
+from profiler import PROFILER
+from tween import DEAL_SPIN, TweenGroup, stagger
 
 # Window settings
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
 SCREEN_TITLE = "Sabacc Deck Test"
 
-# Asset paths
-CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-ASSETS_DIR = os.path.join(CURRENT_DIR, "..", "assets")
-CARD_BACK_IMAGE = os.path.join(ASSETS_DIR, "cards", "Back.png")
-BACKGROUND_IMAGE = os.path.join(ASSETS_DIR, "background.png")
-DICE_IMAGE_DIR = os.path.join(ASSETS_DIR, "dice")
-DICE_IMAGES = [
-    os.path.join(DICE_IMAGE_DIR, f"Spike Die {i+1} Holo.png") for i in range(6)
-]
-
-# Card constants
-CARD_VALUES = ["+1", "+2", "+3", "+4", "+5", "+6", "+7", "+8", "+9", "+10",
-               "-1", "-2", "-3", "-4", "-5", "-6", "-7", "-8", "-9", "-10"]
-CARD_SUITS = [" Circle", " Square", " Triangle"]
-ZERO_VALUE = ["0", "0"]
-ZERO_SUIT = [" Sylop"]
-
 CARD_SCALE = 0.25
 
-def card_filename(card_value, card_suit):
-    return os.path.join(ASSETS_DIR, "cards", f"{card_value}{card_suit}.png")
-
-class Card(arcade.Sprite):
-    def __init__(self, card_value, card_suit, scale):
-        filename = card_filename(card_value, card_suit)
-        super().__init__(filename, scale)
-        self.card_value = card_value
-        self.card_suit = card_suit
-        self.image_filename = filename
-        self.target_x = None
-        self.target_y = None
+# Players 2-4 are played by the computer; they take their turns when Roll Dice is pressed
+AI_PLAYERS = (1, 2, 3)
+AI_TIME_BUDGET = 0.05
+AI_MOVE_DELAY = 0.4  # Pause between computer moves so they can be followed
+
+# Every action on a local table is recorded. Left/Right step back and forward through the
+# recorded events, Home jumps to the start of the game, End returns to the live table, L saves the log.
+SCRUB_KEYS = (arcade.key.LEFT, arcade.key.RIGHT, arcade.key.HOME, arcade.key.END)
+
+# A local table is snapshotted to AUTOSAVE_FILE at most every AUTOSAVE_INTERVAL seconds
+# while it changes; --resume restores it after a crash
+AUTOSAVE_FILE = "sabacc_table.snap"
+AUTOSAVE_INTERVAL = 1.0
+
+# Frame profiler overlay, toggled with O
+PROFILER_REFRESH = 0.25  # Seconds between overlay text updates
+PROFILER_BOX_W = 360
+
+def sync_sprite_list(sprite_list, sprites):
+    # Make sprite_list hold exactly sprites, in order. The matching prefix is left alone and the
+    # rest re-appended; SpriteList.insert does not flag the index buffer for upload, so avoid it.
+    current = sprite_list.sprite_list
+    if current == sprites:
+        return
+    keep = 0
+    while keep < len(current) and keep < len(sprites) and current[keep] is sprites[keep]:
+        keep += 1
+    for sprite in current[keep:]:
+        sprite_list.remove(sprite)
+    for sprite in sprites[keep:]:
+        sprite_list.append(sprite)
+
+# Thin sprite view of an engine card id; the rules only ever see the id.
+# Starts out showing the card back until its face has been decoded in the background.
+# Textures come from a pre-shrunk level (see textures.CARD_LEVELS); level is the one shown,
+# face_level the one face_path will bring, and the sprite scale is relative to the level.
+class CardSprite(arcade.Sprite):
+    def __init__(self, card, scale, level):
+        super().__init__(texture=textures.back_texture(level), scale=scale / level)
+        self.card = card
+        self.level = level
+        self.face_level = level
+        self.face_path = textures.card_filename(card, level)
         self.dealing = False
-        self.deal_angle = 0
-        self.deal_speed = 0
-        self.deal_spin = 0
 
 class DeckTestWindow(arcade.Window):
-    def __init__(self):
+    def __init__(self, client=None):
+        self.started = time.perf_counter()
+        self.first_frame_time = None
+        # Redraw on change, see on_draw; set before pyglet can dispatch on_resize
+        self.always_redraw = False
+        self.needs_redraw = True
+        self.frame_skipped = False
+        self.drawn_key = None
         super().__init__(
             SCREEN_WIDTH,
             SCREEN_HEIGHT,
             SCREEN_TITLE,
             resizable=True
         )
-        self.deck = arcade.SpriteList()
+        # With a netclient.TableClient the game mirrors a server table shared with other players
+        self.client = client
+        self.game = engine.Game()
+        # While scrubbing, game is a replay after scrub events and live_game the table in play
+        self.event_log = eventlog.EventLog()
+        self.live_game = None
+        self.scrub = None
+        self.saved_version = None
+        # Only the table main() opens saves itself, never a benchmark or test window
+        self.autosave_enabled = False
+        self.autosave_wait = 0.0
+        self.card_sprites = []
         self.movable_cards = arcade.SpriteList()
+        # Hands and the visible discard cards, one batched sprite list per zone
+        self.hand_sprites = [arcade.SpriteList() for _ in range(self.game.num_players)]
+        self.discard_sprites = arcade.SpriteList()
+        self.zones_key = None
+        # Prebuilt table chrome, see sync_chrome
+        self.chrome_under = None
+        self.chrome_over = None
+        self.chrome_key = None
+        # Draw pile back and the two dice; their textures come from the shared atlas
+        self.table_sprites = arcade.SpriteList()
+        self.draw_pile_sprite = None
+        self.dice_sprites = arcade.SpriteList()
         self.held_card = None
         self.held_card_offset_x = 0
         self.held_card_offset_y = 0
@@ -68,301 +124,451 @@ class DeckTestWindow(arcade.Window):
         self.reset_w = 180
         self.reset_h = 60
 
-        self.discard_pile = []
-        self.player_piles = [[] for _ in range(4)]
-        self.deal_queue = []
+        self.deal_tweens = TweenGroup(on_land=self.on_card_landed)
         self.dealing = False
-        self.deal_timer = 0
-        self.swap_candidate = False
-        self.last_discarded_card = None
-        self.previous_discard_top = None
         self.dice_result_text = ""
         self.last_dice = [None, None]  # Store the last dice roll
         self.show_sabacc_shift = False  # Track if "Sabacc Shift" should be shown
         # --- Dice animation state ---
         self.rolling = False
-        self.roll_start_time = 0
-        self.roll_duration = 1.2
-        self.roll_end_result = [1, 1]
-        self.roll_stop_times = [0, 0]
-        self.roll_intervals = [0.04, 0.04]
-        self.roll_next_update = [0, 0]
+        self.dice_roll = None
+        # Searches run in a worker process; on_update only collects finished decisions
+        self.ai_executor = None
+        self.ai_future = None
+        self.ai_seat = None
+        self.ai_wait = 0.0
+        self.profiler_next_refresh = 0.0
         self.background = None
+        # Textures still being decoded in the background, see poll_assets
+        self.faces_pending = []
+        self.dice_faces = None
+        self.assets_reported = False
 
         self.card_scale = CARD_SCALE
+        self.card_level = textures.level_for(CARD_SCALE)
         self.show_card_resizer = False
 
-        self.round = 1
-        self.max_rounds = 3
         self.show_winner = False
         self.winner_text = ""
-        # Add a button for "Show Winner"
-        self.show_winner_button_w = 220
-        self.show_winner_button_h = 60
+
+        # Buttons and drop zones are indexed per layout, cards whenever they move
+        self.static_hits = SpatialIndex()
+        self.card_hits = SpatialIndex()
+        self.card_hits_key = None
+        self.card_moves = 0
+
+        self.layout = None
+        self.update_layout()
+
+        self.hud = hud.Hud(self.game.num_players)
 
     def get_dynamic_positions(self):
-        margin = 60
-        pile_width = int(self.width * 0.08)
-        pile_height = int(self.height * 0.175)
-        pile_width = max(70, min(pile_width, 140))
-        pile_height = max(100, min(pile_height, 200))
-
-        # --- Expand player box width for easier dropping ---
-        player_box_extra = int(self.width * 0.15)  # Add 15% of width to each player box
-        player_box_width = pile_width + player_box_extra
-        player_box_height = pile_height + 30  # Slightly taller too
-
-        button_width = int(self.width * 0.18)
-        button_height = int(self.height * 0.075)
-        button_width = max(120, min(button_width, 300))
-        button_height = max(40, min(button_height, 80))
-
-        dice_button_w = int(self.width * 0.14)
-        dice_button_h = button_height
-        dice_button_x = self.width - margin - dice_button_w // 2
-        dice_button_y = self.height - margin - dice_button_h // 2
-
-        reset_w = button_width
-        reset_h = button_height
-
-        button_x = self.width - margin - button_width // 2
-        button_y = margin + button_height // 2
-        draw_pile_x = button_x
-        draw_pile_y = button_y + button_height // 2 + pile_height // 2 + 10
-
-        discard_pile_x = draw_pile_x - pile_width - 40
-        discard_pile_y = draw_pile_y
-
-        reset_x = margin + reset_w // 2
-        reset_y = margin + reset_h // 2
-
-        player_pile_positions = [
-            (self.width // 2, self.height - margin - pile_height // 2),  # Top
-            (self.width - margin - pile_width // 2, self.height // 2),   # Right
-            (self.width // 2, margin + pile_height // 2 + button_height + 40),  # Bottom
-            (margin + pile_width // 2, self.height // 2),                # Left
-        ]
-
-        # Add player box sizes to positions dict
-        return {
-            "pile_width": pile_width,
-            "pile_height": pile_height,
-            "player_box_width": player_box_width,
-            "player_box_height": player_box_height,
-            "button_x": button_x,
-            "button_y": button_y,
-            "button_width": button_width,
-            "button_height": button_height,
-            "draw_pile_x": draw_pile_x,
-            "draw_pile_y": draw_pile_y,
-            "discard_pile_x": discard_pile_x,
-            "discard_pile_y": discard_pile_y,
-            "dice_button_x": dice_button_x,
-            "dice_button_y": dice_button_y,
-            "dice_button_w": dice_button_w,
-            "dice_button_h": dice_button_h,
-            "reset_x": reset_x,
-            "reset_y": reset_y,
-            "reset_w": reset_w,
-            "reset_h": reset_h,
-            "player_pile_positions": player_pile_positions,
-            "show_winner_button_x": self.width - margin - dice_button_w // 2,
-            "show_winner_button_y": dice_button_y - dice_button_h // 2 - 40 - self.show_winner_button_h // 2,
-            "show_winner_button_w": self.show_winner_button_w,
-            "show_winner_button_h": self.show_winner_button_h,
-        }
+        # Cached per window size and card scale; see update_layout
+        return self.layout
+
+    def update_layout(self):
+        self.layout = compute_layout(self.width, self.height, self.card_scale)
+        self.build_static_hits()
+
+    def build_static_hits(self):
+        pos = self.layout
+        hits = self.static_hits
+        hits.clear()
+        hits.insert("dice_box", Rect.from_center(self.width // 2, self.height // 2, DICE_BOX_W, DICE_BOX_H))
+        hits.insert("discard", Rect.from_center(pos.discard_pile_x, pos.discard_pile_y, pos.pile_width, pos.pile_height))
+        hits.insert("draw_pile", Rect.from_center(pos.draw_pile_x, pos.draw_pile_y, pos.pile_width, pos.pile_height))
+        hits.insert("roll_dice", Rect.from_center(pos.dice_button_x, pos.dice_button_y, pos.dice_button_w, pos.dice_button_h))
+        hits.insert("deal", Rect.from_center(pos.button_x, pos.button_y, pos.button_width, pos.button_height))
+        hits.insert("reset", Rect.from_center(pos.reset_x, pos.reset_y, pos.reset_w, pos.reset_h))
+        hits.insert("show_winner", Rect.from_center(
+            pos.show_winner_button_x, pos.show_winner_button_y, pos.show_winner_button_w, pos.show_winner_button_h
+        ))
+        # Player drop zones use the expanded player boxes
+        for i, (x, y) in enumerate(pos.player_pile_positions):
+            hits.insert(("hand", i), Rect.from_center(x, y, pos.player_box_width, pos.player_box_height))
+
+    def set_card_scale(self, scale):
+        # Crossing into another texture level queues that level's faces; every card keeps its
+        # current texture, at the matching scale, until the new one is decoded in poll_assets
+        self.card_scale = scale
+        level = textures.level_for(scale)
+        if level != self.card_level:
+            self.card_level = level
+            back = textures.back_texture(level)
+            self.ctx.default_atlas.add(back)
+            self.draw_pile_sprite.texture = back
+            for sprite in self.card_sprites:
+                sprite.face_level = level
+                sprite.face_path = textures.card_filename(sprite.card, level)
+            textures.load_async([sprite.face_path for sprite in self.card_sprites])
+            self.faces_pending = list(self.card_sprites)
+        for sprite in self.card_sprites:
+            sprite.scale = scale / sprite.level
+        self.update_layout()
+
+    def sync_card_hits(self):
+        # Cards on the table and in hands, topmost first; cards still flying in a deal are skipped
+        self.sync_zones()
+        card_hits_key = (self.game.version, self.layout, self.card_moves)
+        if card_hits_key == self.card_hits_key:
+            return
+        self.card_hits_key = card_hits_key
+        hits = self.card_hits
+        hits.clear()
+        for sprite in reversed(self.movable_cards):
+            hits.insert(sprite, sprite_rect(sprite), "table")
+        for player, hand in enumerate(self.game.hands):
+            for card in reversed(hand):
+                sprite = self.sprite_for(card)
+                if not sprite.dealing:
+                    hits.insert(sprite, sprite_rect(sprite), ("hand", player))
+
+    def card_at(self, x, y):
+        self.sync_card_hits()
+        for hit in self.card_hits.query_point(x, y):
+            if hit.target.collides_with_point((x, y)):
+                return hit
+        return None
+
+    def on_resize(self, width, height):
+        super().on_resize(width, height)
+        self.needs_redraw = True
+        # pyglet can dispatch on_resize from inside the window constructor
+        if hasattr(self, "layout"):
+            self.update_layout()
 
     def setup(self):
-        self.deck = arcade.SpriteList()
-        deck = []
-        for suit in CARD_SUITS:
-            for value in CARD_VALUES:
-                deck.append(Card(value, suit, CARD_SCALE))
-        for sylop in ZERO_SUIT:
-            for value in ZERO_VALUE:
-                deck.append(Card(value, sylop, CARD_SCALE))
-        random.shuffle(deck)
-        for card in deck:
-            card.center_x = 0
-            card.center_y = 0
-            self.deck.append(card)
+        # A server table is mirrored, not recorded: its state also changes with other players' actions
+        self.event_log = eventlog.EventLog()
+        self.live_game = None
+        self.scrub = None
+        if self.client is not None:
+            self.game = netclient.RemoteGame(self.client)
+        else:
+            self.game = engine.Game(log=self.event_log)
+        self.hand_sprites = [arcade.SpriteList() for _ in range(self.game.num_players)]
+        self.discard_sprites = arcade.SpriteList()
+        self.zones_key = None
+        # Only the card back is loaded up front; faces, dice and background load in the background
+        self.ctx.default_atlas.add(textures.back_texture(self.card_level))
+        textures.load_async(textures.startup_paths(self.game.cards, self.card_level))
+        # Sprites are indexed by engine card id
+        self.card_sprites = []
+        for card in self.game.cards:
+            sprite = CardSprite(card, self.card_scale, self.card_level)
+            sprite.center_x = 0
+            sprite.center_y = 0
+            self.card_sprites.append(sprite)
+        self.faces_pending = list(self.card_sprites)
         self.movable_cards = arcade.SpriteList()
         self.held_card = None
         self.held_card_origin = None
-        self.player_piles = [[] for _ in range(4)]
-        self.deal_queue = []
+        self.deal_tweens = TweenGroup(on_land=self.on_card_landed)
         self.dealing = False
-        self.deal_timer = 0
-        self.discard_pile = []
-        self.swap_candidate = False
-        self.last_discarded_card = None
-        self.previous_discard_top = None
         self.dice_result_text = ""
         self.last_dice = [None, None]
 
-        if os.path.exists(BACKGROUND_IMAGE):
-            self.background = arcade.load_texture(BACKGROUND_IMAGE)
+        self.table_sprites = arcade.SpriteList()
+        self.draw_pile_sprite = arcade.Sprite(texture=textures.back_texture(self.card_level))
+        self.table_sprites.append(self.draw_pile_sprite)
+        self.dice_sprites = arcade.SpriteList()
+        self.dice_faces = None  # Collected by poll_assets, or on first use if still loading
+        for _ in range(2):
+            self.dice_sprites.append(arcade.Sprite(texture=textures.back_texture()))
+
+        self.background = None
+        self.assets_reported = False
+
+    def poll_assets(self):
+        # Swaps decoded card faces in for their placeholders, without ever waiting on the loader
+        if self.faces_pending:
+            atlas = self.ctx.default_atlas
+            waiting = []
+            for sprite in self.faces_pending:
+                texture = textures.ready_texture(sprite.face_path)
+                if texture is None:
+                    waiting.append(sprite)
+                    continue
+                atlas.add(texture)
+                sprite.texture = texture
+                if sprite.level != sprite.face_level:
+                    sprite.level = sprite.face_level
+                    sprite.scale = self.card_scale / sprite.level
+            self.faces_pending = waiting
+        if self.dice_faces is None:
+            faces = [textures.ready_texture(path) for path in textures.DICE_IMAGES]
+            if None not in faces:
+                self.dice_faces = faces
+        if self.background is None and os.path.exists(textures.BACKGROUND_IMAGE):
+            self.background = textures.ready_texture(textures.BACKGROUND_IMAGE)
+        if not self.assets_reported and not self.faces_pending and textures.pending_count() == 0:
+            self.assets_reported = True
+            now = time.perf_counter()
+            first_frame = self.first_frame_time - self.started if self.first_frame_time else now - self.started
+            print(
+                f"Startup: first frame after {first_frame:.2f}s, "
+                f"all textures loaded after {now - self.started:.2f}s on {textures.LOADER_THREADS} threads"
+            )
+
+    def sync_remote(self):
+        # Shows what the server changed, including cards other players moved or left on the table
+        changed = self.game.sync()
+        if not changed:
+            return
+        self.sync_table_cards()
+        game = self.game
+        if "dice" in changed and game.last_dice and not self.rolling:
+            die1, die2 = game.last_dice
+            self.last_dice = [die1, die2]
+            self.dice_result_text = f"Dice: {die1}, {die2}"
+            self.show_sabacc_shift = (die1 == die2)
+
+    def sync_table_cards(self):
+        # Makes the movable cards match the engine table after the game changed underneath
+        # the window; cards that weren't there yet appear on the draw pile
+        game = self.game
+        pos = self.get_dynamic_positions()
+        shown = set()
+        for sprite in list(self.movable_cards):
+            if game.in_zone(sprite.card, engine.TABLE_ZONE) or sprite is self.held_card:
+                shown.add(sprite.card)
+            else:
+                self.movable_cards.remove(sprite)
+        for card in game.table:
+            sprite = self.sprite_for(card)
+            if card not in shown:
+                sprite.center_x = pos.draw_pile_x
+                sprite.center_y = pos.draw_pile_y
+                self.movable_cards.append(sprite)
+        self.zones_key = None
+        self.card_moves += 1
+
+    def scrub_to(self, position):
+        # Shows the table as it was after the first position events, or the live table again
+        # once position reaches the end of the log. The table can't be played while scrubbing.
+        log = self.event_log
+        if self.live_game is None:
+            if self.client is not None or self.dealing or self.rolling or self.ai_seat is not None or self.held_card:
+                return
+            self.live_game = self.game
+        # A restored table's log starts from its snapshot, which is position 0
+        position = max(0 if log.base else 1, min(position, len(log)))
+        while log.seeding(position):
+            position += 1
+        if position == len(log):
+            self.game = self.live_game
+            self.live_game = None
+            self.scrub = None
         else:
-            self.background = None
+            self.game = eventlog.replay(log, position, self.live_game.num_players)
+            self.scrub = position
+        game = self.game
+        self.last_dice = list(game.last_dice) if game.last_dice else [None, None]
+        self.dice_result_text = f"Dice: {game.last_dice[0]}, {game.last_dice[1]}" if game.last_dice else ""
+        self.show_sabacc_shift = False
+        self.show_winner = False
+        self.sync_table_cards()
+
+    def restore_table(self, data):
+        # Continues a table from an engine snapshot; its event log starts from the snapshot
+        self.reset_deck()
+        self.event_log = eventlog.EventLog(base=data)
+        self.game = engine.Game.from_snapshot(data, log=self.event_log)
+        game = self.game
+        self.last_dice = list(game.last_dice) if game.last_dice else [None, None]
+        self.dice_result_text = f"Dice: {game.last_dice[0]}, {game.last_dice[1]}" if game.last_dice else ""
+        self.sync_table_cards()
+        self.saved_version = game.version
+
+    def autosave(self, delta_time):
+        if not self.autosave_enabled:
+            return
+        self.autosave_wait -= delta_time
+        if self.autosave_wait > 0 or self.client is not None or self.live_game is not None:
+            return
+        if self.game.version == self.saved_version:
+            return
+        self.autosave_wait = AUTOSAVE_INTERVAL
+        self.saved_version = self.game.version
+        # Written beside the old file and swapped in, so a crash mid-write keeps the last save
+        temp_path = AUTOSAVE_FILE + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.game.snapshot())
+        os.replace(temp_path, AUTOSAVE_FILE)
 
     def reset_deck(self):
-        all_cards = []
-        for pile in self.player_piles:
-            all_cards.extend(pile)
-            pile.clear()
-        all_cards.extend(self.movable_cards)
+        self.game.reset()
+        for sprite in self.card_sprites:
+            sprite.center_x = 0
+            sprite.center_y = 0
+            sprite.angle = 0
+            sprite.dealing = False
         self.movable_cards = arcade.SpriteList()
-        all_cards.extend(self.discard_pile)
-        self.discard_pile.clear()
-        all_cards.extend(self.deck)
-        self.deck = arcade.SpriteList()
-        random.shuffle(all_cards)
-        for card in all_cards:
-            card.center_x = 0
-            card.center_y = 0
-            card.angle = 0
-        self.deck.extend(all_cards)
         self.held_card = None
         self.held_card_origin = None
-        self.deal_queue = []
+        self.deal_tweens.clear()
         self.dealing = False
-        self.swap_candidate = False
-        self.last_discarded_card = None
-        self.previous_discard_top = None
+        self.rolling = False
+        self.dice_roll = None
+        self.ai_future = None
+        self.ai_seat = None
         self.dice_result_text = ""
         self.last_dice = [None, None]
-        self.round = 1
         self.show_winner = False
         self.winner_text = ""
 
-    def get_card_value(self, card):
-        try:
-            return int(card.card_value)
-        except Exception:
-            return 0
+    def sprite_for(self, card):
+        return self.card_sprites[card]
 
     def get_player_score(self, player_index):
-        hand = self.player_piles[player_index]
-        score = sum(self.get_card_value(card) for card in hand)
-        sylop_zeros = [card for card in hand if card.card_value == "0" and card.card_suit == " Sylop"]
-        if len(sylop_zeros) == 2:
-            return "Pure Sabacc"
-        elif score == 0 and len(hand) > 0:
-            return "Sabacc"
-        else:
-            return score
+        return self.game.score(player_index)
+
+    def sync_zones(self):
+        # Hands and the discard pile are drawn from their own sprite lists. Their sprites are
+        # only repositioned when the game state or the layout changed since the last frame.
+        zones_key = (self.game.version, self.layout)
+        if zones_key == self.zones_key:
+            return
+        self.zones_key = zones_key
+        game = self.game
+        pos = self.layout
+        pile_width = pos.pile_width
+
+        self.draw_pile_sprite.center_x = pos.draw_pile_x
+        self.draw_pile_sprite.center_y = pos.draw_pile_y
+        self.draw_pile_sprite.width = pile_width
+        self.draw_pile_sprite.height = pos.pile_height
+
+        for i, hand in enumerate(game.hands):
+            pile = [self.sprite_for(card) for card in hand]
+            pile_center_x, pile_center_y = pos.player_pile_positions[i]
+            num_cards = len(pile)
+            base_spacing = int(pile_width * 0.5)
+            hand_width = (num_cards - 1) * base_spacing if num_cards > 1 else 0
+
+            if i == 1:
+                rightmost_x = pile_center_x + hand_width // 2
+                overflow = max(0, rightmost_x + pile_width // 2 - self.width)
+                start_x = pile_center_x + hand_width // 2 - overflow
+                step = -base_spacing
+            elif i == 3:
+                leftmost_x = pile_center_x - hand_width // 2
+                overflow = max(0, pile_width // 2 - leftmost_x)
+                start_x = pile_center_x - hand_width // 2 + overflow
+                step = base_spacing
+            else:
+                start_x = pile_center_x - hand_width // 2
+                step = base_spacing
+            for idx, card in enumerate(pile):
+                card.alpha = 255
+                if not card.dealing:
+                    card.center_x = start_x + idx * step
+                    card.center_y = pile_center_y
+            sync_sprite_list(self.hand_sprites[i], pile)
+
+        shown = []
+        if game.discard:
+            if (
+                game.swap_candidate
+                and game.in_zone(game.last_discarded, engine.DISCARD_ZONE)
+                and game.previous_discard_top is not None
+            ):
+                # Show the card that can be swapped back, with the new discard as a faded ghost beside it
+                if game.in_zone(game.previous_discard_top, engine.DISCARD_ZONE):
+                    shown.append(self.sprite_for(game.previous_discard_top))
+                ghost = self.sprite_for(game.last_discarded)
+                ghost.alpha = 128
+                ghost.center_x = pos.discard_pile_x - pile_width // 2
+                ghost.center_y = pos.discard_pile_y
+                ghost.angle = 0
+            else:
+                ghost = None
+                shown.append(self.sprite_for(game.discard[-1]))
+            for sprite in shown:
+                sprite.alpha = 255
+                sprite.center_x = pos.discard_pile_x
+                sprite.center_y = pos.discard_pile_y
+                sprite.angle = 0
+            if ghost is not None:
+                shown.append(ghost)
+        sync_sprite_list(self.discard_sprites, shown)
+
+    def show_winner_button_visible(self):
+        return self.game.is_over or self.show_winner
+
+    def sync_chrome(self):
+        # The chrome batches are rebuilt only on resize or when the deal / show winner state flips
+        chrome_key = (self.layout, self.dealing, self.show_winner_button_visible())
+        if chrome_key == self.chrome_key:
+            return
+        self.chrome_key = chrome_key
+        self.chrome_under = chrome.build_under_cards(self.layout)
+        self.chrome_over = chrome.build_over_cards(self.layout, self.dealing, chrome_key[2])
+
+    def frame_key(self):
+        # Everything besides input and animation that changes what a frame shows
+        return (
+            self.game, self.game.version, self.card_moves, self.layout, len(self.faces_pending),
+            self.background is None, self.dice_faces is None, self.ai_seat, self.dealing, self.rolling,
+        )
+
+    def on_expose(self):
+        self.needs_redraw = True
 
     def on_draw(self):
+        # Frames where nothing changed are skipped and flip() keeps the last one on screen,
+        # so an idle table costs next to nothing. Input, animation and state changes redraw.
+        self.frame_skipped = not (self.needs_redraw or self.always_redraw)
+        if self.frame_skipped:
+            return
+        self.needs_redraw = False
+        self.drawn_key = self.frame_key()
+        self.draw_frame()
+
+    def flip(self):
+        if not self.frame_skipped:
+            super().flip()
+
+    def draw_frame(self):
+        profiler = PROFILER
+        profiler.begin_frame()
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter()
         arcade.start_render()
         # Draw background if available
         if self.background:
             arcade.draw_lrwh_rectangle_textured(
                 0, 0, self.width, self.height, self.background
             )
+        profiler.lap("background")
         pos = self.get_dynamic_positions()
-        pile_width = pos["pile_width"]
-        pile_height = pos["pile_height"]
-        player_box_width = pos["player_box_width"]
-        player_box_height = pos["player_box_height"]
+        pile_height = pos.pile_height
+        game = self.game
+        self.sync_chrome()
 
-        # --- Draw expanded transparent player boxes BEFORE cards ---
-        for i, (x, y) in enumerate(pos["player_pile_positions"]):
-            arcade.draw_rectangle_filled(
-                x, y, player_box_width, player_box_height,
-                (*arcade.color.LIGHT_GREEN, 40)
-            )
-
-        # Draw discard pile area (rectangle)
-        pre_discard_offset = -pile_width // 2
-        pre_discard_x = pos["discard_pile_x"] + pre_discard_offset
-        pre_discard_y = pos["discard_pile_y"]
-
-        arcade.draw_rectangle_outline(
-            pos["discard_pile_x"], pos["discard_pile_y"], pile_width, pile_height, arcade.color.LIGHT_GRAY, 3
-        )
-        arcade.draw_text("Discard", pos["discard_pile_x"] - 40, pos["discard_pile_y"] + pile_height // 2 + 10, arcade.color.LIGHT_GRAY, 16)
+        # --- Draw expanded transparent player boxes and the discard pile area BEFORE cards ---
+        self.chrome_under.draw()
+        labels = self.hud
+        labels.discard.draw(x=pos.discard_pile_x - 40, y=pos.discard_pile_y + pile_height // 2 + 10)
+        profiler.lap("chrome")
 
         # Draw top card of discard pile face up, if any
-        if self.discard_pile:
-            if (
-                self.swap_candidate
-                and self.last_discarded_card in self.discard_pile
-                and self.previous_discard_top is not None
-            ):
-                if self.previous_discard_top and self.previous_discard_top in self.discard_pile:
-                    self.previous_discard_top.alpha = 255
-                    self.previous_discard_top.center_x = pos["discard_pile_x"]
-                    self.previous_discard_top.center_y = pos["discard_pile_y"]
-                    self.previous_discard_top.angle = 0
-                    self.previous_discard_top.draw()
-                self.last_discarded_card.alpha = 128
-                self.last_discarded_card.center_x = pre_discard_x
-                self.last_discarded_card.center_y = pre_discard_y
-                self.last_discarded_card.angle = 0
-                self.last_discarded_card.draw()
-                self.last_discarded_card.alpha = 255
-                self.last_discarded_card.center_x = pos["discard_pile_x"]
-            else:
-                self.discard_pile[-1].alpha = 255
-                self.discard_pile[-1].center_x = pos["discard_pile_x"]
-                self.discard_pile[-1].center_y = pos["discard_pile_y"]
-                self.discard_pile[-1].angle = 0
-                self.discard_pile[-1].draw()
+        self.sync_zones()
+        self.discard_sprites.draw()
         # Draw draw pile as card back
-        arcade.draw_texture_rectangle(
-            pos["draw_pile_x"],
-            pos["draw_pile_y"],
-            pile_width,
-            pile_height,
-            arcade.load_texture(CARD_BACK_IMAGE)
-        )
+        self.table_sprites.draw()
         # Draw all cards that have been drawn and placed
         self.movable_cards.draw()
+        profiler.lap("piles")
         # Draw player piles (cards in each pile)
-        for i, pile in enumerate(self.player_piles):
-            pile_center_x, pile_center_y = pos["player_pile_positions"][i]
-            num_cards = len(pile)
-            base_spacing = int(pile_width * 0.5)
-            hand_width = (num_cards - 1) * base_spacing if num_cards > 1 else 0
+        for sprites in self.hand_sprites:
+            sprites.draw()
+        profiler.lap("hands")
 
-            if i == 1:
-                rightmost_x = pile_center_x + hand_width // 2
-                overflow = max(0, rightmost_x + pile_width // 2 - self.width)
-                shift = overflow if overflow > 0 else 0
-                start_x = pile_center_x + hand_width // 2 - shift
-                for idx, card in enumerate(pile):
-                    if not getattr(card, "dealing", False):
-                        card.center_x = start_x - idx * base_spacing
-                        card.center_y = pile_center_y
-                    card.draw()
-            elif i == 3:
-                leftmost_x = pile_center_x - hand_width // 2
-                overflow = max(0, pile_width // 2 - leftmost_x)
-                shift = overflow if overflow > 0 else 0
-                start_x = pile_center_x - hand_width // 2 + shift
-                for idx, card in enumerate(pile):
-                    if not getattr(card, "dealing", False):
-                        card.center_x = start_x + idx * base_spacing
-                        card.center_y = pile_center_y
-                    card.draw()
-            else:
-                start_x = pile_center_x - hand_width // 2
-                for idx, card in enumerate(pile):
-                    if not getattr(card, "dealing", False):
-                        card.center_x = start_x + idx * base_spacing
-                        card.center_y = pile_center_y
-                    card.draw()
-
-        # --- Draw player name and score overlays (after cards) ---
-        for i, (x, y) in enumerate(pos["player_pile_positions"]):
-            # Translucent background for player name
-            name_bg_w, name_bg_h = 110, 32
-            name_bg_x = x
-            name_bg_y = y + pile_height // 2 + 26
-            arcade.draw_rectangle_filled(
-                name_bg_x, name_bg_y, name_bg_w, name_bg_h, (30, 60, 30, 180)
-            )
-            arcade.draw_text(f"Player {i+1}", x - 40, name_bg_y - 12, arcade.color.LIGHT_GREEN, 16)
+        # --- Draw player name and score overlays, buttons and round box (after cards) ---
+        self.chrome_over.draw()
+        for i, (x, name_bg_y) in enumerate(pos.name_bg_positions):
+            labels.player_names[i].draw(x=x - 40, y=name_bg_y - 12)
 
             # Score text and background
             score = self.get_player_score(i)
@@ -376,66 +582,50 @@ class DeckTestWindow(arcade.Window):
                 score_text = f"Score: {score}"
                 score_color = arcade.color.YELLOW_ORANGE if isinstance(score, int) and score >= 0 else arcade.color.RED
 
-            # --- Make the score background wider for long negative numbers ---
-            score_bg_w, score_bg_h = 210, 44
-            score_bg_x = x
-            score_bg_y = y - pile_height // 2 - 18
-            arcade.draw_rectangle_filled(
-                score_bg_x, score_bg_y, score_bg_w, score_bg_h, (30, 60, 30, 180)
-            )
-            arcade.draw_text(
-                score_text,
-                x - score_bg_w // 2 + 10,
-                score_bg_y - 14,
-                score_color,
-                22,
-                width=score_bg_w - 20,
-                align="center",
-                bold=True,
-                font_name="Arial"
-            )
+            score_bg_y = pos.score_bg_positions[i][1]
+            labels.scores[i].draw(score_text, x - SCORE_BG_W // 2 + 10, score_bg_y - 14, score_color)
         # Info
-        arcade.draw_text(f"Cards left in pile: {len(self.deck)}", 20, self.height - 40, arcade.color.WHITE, 20)
-        arcade.draw_text("Click the pile to draw a card. Drag to move.", 20, self.height - 70, arcade.color.AQUA, 18)
+        labels.cards_left.draw(f"Cards left in pile: {len(game.deck)}", 20, self.height - 40)
+        labels.help.draw(x=20, y=self.height - 70)
         # Deal button
-        color = arcade.color.DARK_BLUE if not self.dealing else arcade.color.GRAY
-        arcade.draw_rectangle_filled(pos["button_x"], pos["button_y"], pos["button_width"], pos["button_height"], color)
-        arcade.draw_text(
-            "Deal Cards",
-            pos["button_x"] - 70,
-            pos["button_y"] - 18,
-            arcade.color.WHITE,
-            28,
-        )
+        labels.deal.draw(x=pos.button_x - 70, y=pos.button_y - 18)
         if self.dealing:
-            arcade.draw_text("Dealing...", pos["button_x"] - 60, pos["button_y"] + 50, arcade.color.YELLOW, 22)
+            labels.dealing.draw(x=pos.button_x - 60, y=pos.button_y + 50)
         # Draw reset button
-        arcade.draw_rectangle_filled(pos["reset_x"], pos["reset_y"], pos["reset_w"], pos["reset_h"], arcade.color.DARK_RED)
-        arcade.draw_text("Reset Deck", pos["reset_x"] - 70, pos["reset_y"] - 18, arcade.color.WHITE, 28)
+        labels.reset.draw(x=pos.reset_x - 70, y=pos.reset_y - 18)
         # Draw Roll Dice button
-        arcade.draw_rectangle_filled(pos["dice_button_x"], pos["dice_button_y"], pos["dice_button_w"], pos["dice_button_h"], arcade.color.DARK_GREEN)
-        arcade.draw_text("Roll Dice", pos["dice_button_x"] - 60, pos["dice_button_y"] - 18, arcade.color.WHITE, 28)
-        if self.dice_result_text:
-            arcade.draw_text(self.dice_result_text, pos["dice_button_x"] - 60, pos["dice_button_y"] + 40, arcade.color.YELLOW, 22)
+        labels.roll_dice.draw(x=pos.dice_button_x - 60, y=pos.dice_button_y - 18)
+        if self.scrub is not None:
+            labels.ai_status.draw(
+                f"Replay: event {self.scrub} of {len(self.event_log)}", pos.dice_button_x - 60, pos.dice_button_y + 40
+            )
+        elif self.ai_seat is not None:
+            labels.ai_status.draw(f"Player {self.ai_seat + 1} is playing...", pos.dice_button_x - 60, pos.dice_button_y + 40)
+        elif self.dice_result_text:
+            labels.dice_result.draw(self.dice_result_text, pos.dice_button_x - 60, pos.dice_button_y + 40)
+        profiler.lap("hud")
 
         # --- Draw dice images in the center of the window with animation ---
         if self.last_dice[0] is not None and self.last_dice[1] is not None:
-            dice_size = 96
+            if self.dice_faces is None:
+                self.dice_faces = textures.dice_faces()
+            dice_size = DICE_SIZE
             center_x = self.width // 2
             center_y = self.height // 2
             offset = 70
-            box_w = dice_size * 2 + 40
-            box_h = dice_size + 40
             # Draw translucent background box behind dice
-            arcade.draw_rectangle_filled(center_x, center_y, box_w, box_h, (30, 30, 30, 180))
+            arcade.draw_rectangle_filled(center_x, center_y, DICE_BOX_W, DICE_BOX_H, (30, 30, 30, 180))
             # Draw dice (animated if rolling)
             for i, die in enumerate(self.last_dice):
-                if die is not None and 1 <= die <= 6:
-                    dx = center_x + (i * 2 - 1) * offset
-                    arcade.draw_texture_rectangle(
-                        dx, center_y, dice_size, dice_size,
-                        arcade.load_texture(DICE_IMAGES[die - 1])
-                    )
+                die_sprite = self.dice_sprites[i]
+                die_sprite.visible = die is not None and 1 <= die <= 6
+                if die_sprite.visible:
+                    die_sprite.texture = self.dice_faces[die - 1]
+                    die_sprite.center_x = center_x + (i * 2 - 1) * offset
+                    die_sprite.center_y = center_y
+                    die_sprite.width = dice_size
+                    die_sprite.height = dice_size
+            self.dice_sprites.draw()
             # Draw "Sabacc Shift" above dice if needed
             if self.show_sabacc_shift and not self.rolling:
                 msg = "Sabacc Shift"
@@ -446,16 +636,8 @@ class DeckTestWindow(arcade.Window):
                 arcade.draw_rectangle_filled(
                     msg_x, msg_y, msg_w, msg_h, (30, 30, 30, 200)
                 )
-                arcade.draw_text(
-                    msg,
-                    msg_x - msg_w // 2 + 10, msg_y - 22,
-                    arcade.color.GOLD,
-                    32,
-                    width=msg_w - 20,
-                    align="center",
-                    bold=True,
-                    font_name="Arial"
-                )
+                labels.sabacc_shift.draw(msg, msg_x - msg_w // 2 + 10, msg_y - 22)
+        profiler.lap("dice")
 
         # Card resizer overlay (like in game.py)
         if self.show_card_resizer:
@@ -463,7 +645,7 @@ class DeckTestWindow(arcade.Window):
             box_x, box_y = self.width // 2, self.height // 2
             arcade.draw_rectangle_filled(box_x, box_y, box_w, box_h, arcade.color.DARK_SLATE_GRAY + (220,))
             arcade.draw_rectangle_outline(box_x, box_y, box_w, box_h, arcade.color.WHITE, 3)
-            arcade.draw_text("Card Size", box_x - 60, box_y + 40, arcade.color.WHITE, 24)
+            labels.resizer_title.draw(x=box_x - 60, y=box_y + 40)
             # Draw slider
             slider_x = box_x - 100
             slider_y = box_y
@@ -475,37 +657,16 @@ class DeckTestWindow(arcade.Window):
             max_scale = 0.45
             handle_x = slider_x + int((self.card_scale - min_scale) / (max_scale - min_scale) * slider_w)
             arcade.draw_circle_filled(handle_x, slider_y, 14, arcade.color.YELLOW_ORANGE)
-            arcade.draw_text(f"{self.card_scale:.2f}", box_x + 60, box_y - 10, arcade.color.WHITE, 20)
-            arcade.draw_text("Press I to close", box_x - 60, box_y - 60, arcade.color.LIGHT_GRAY, 16)
+            labels.resizer_value.draw(f"{self.card_scale:.2f}", box_x + 60, box_y - 10)
+            labels.resizer_hint.draw(x=box_x - 60, y=box_y - 60)
 
         # --- Draw round counter at top left, but lower so it doesn't cover "cards left" ---
-        round_text = f"Round: {self.round} / {self.max_rounds}"
-        round_box_w = 180
-        round_box_h = 44
-        round_box_x = 30 + round_box_w // 2
-        # Move the round counter down by about 100 pixels from the top
-        round_box_y = self.height - 130 - round_box_h // 2
-        arcade.draw_rectangle_filled(
-            round_box_x, round_box_y, round_box_w, round_box_h, (30, 30, 30, 200)
-        )
-        arcade.draw_text(
-            round_text,
-            round_box_x - round_box_w // 2 + 10, round_box_y - 16,
-            arcade.color.YELLOW, 26, width=round_box_w - 20, align="center", bold=True
-        )
+        round_text = f"Round: {game.round} / {game.max_rounds}"
+        labels.round.draw(round_text, pos.round_box_x - ROUND_BOX_W // 2 + 10, pos.round_box_y - 16)
 
         # --- Draw "Show Winner" button at end of round 3 ---
-        if self.round > self.max_rounds or self.show_winner:
-            arcade.draw_rectangle_filled(
-                pos["show_winner_button_x"], pos["show_winner_button_y"],
-                pos["show_winner_button_w"], pos["show_winner_button_h"],
-                arcade.color.DARK_ORANGE
-            )
-            arcade.draw_text(
-                "Show Winner",
-                pos["show_winner_button_x"] - 90, pos["show_winner_button_y"] - 18,
-                arcade.color.WHITE, 28
-            )
+        if self.show_winner_button_visible():
+            labels.show_winner.draw(x=pos.show_winner_button_x - 90, y=pos.show_winner_button_y - 18)
 
         # --- Draw winner text if available ---
         if self.show_winner and self.winner_text:
@@ -516,20 +677,54 @@ class DeckTestWindow(arcade.Window):
             arcade.draw_rectangle_filled(
                 winner_box_x, winner_box_y, winner_box_w, winner_box_h, (30, 30, 30, 230)
             )
-            arcade.draw_text(
-                self.winner_text,
-                winner_box_x - winner_box_w // 2 + 30, winner_box_y - 38,
-                arcade.color.GOLD, 38, width=winner_box_w - 60, align="center", bold=True
-            )
+            labels.winner.draw(self.winner_text, winner_box_x - winner_box_w // 2 + 30, winner_box_y - 38)
+        profiler.lap("overlays")
+        profiler.end_frame()
+
+        if profiler.enabled:
+            self.draw_profiler()
 
         # ...rest of on_draw...
 
+    def draw_profiler(self):
+        # Overlay text is re-laid out a few times a second, not every frame
+        now = time.perf_counter()
+        if now >= self.profiler_next_refresh:
+            self.profiler_next_refresh = now + PROFILER_REFRESH
+            self.hud.profiler.update("\n".join(PROFILER.report_lines()))
+        box_h = self.hud.profiler.label.content_height + 16
+        top = self.height - 190
+        arcade.draw_lrtb_rectangle_filled(20, 20 + PROFILER_BOX_W, top, top - box_h, (0, 0, 0, 200))
+        self.hud.profiler.draw(x=30, y=top - 8)
+
     def on_key_press(self, symbol, modifiers):
+        self.needs_redraw = True
         if symbol == arcade.key.I:
             self.show_card_resizer = not self.show_card_resizer
+        elif symbol == arcade.key.O:
+            if not PROFILER.toggle():
+                print(f"Frame trace written to {PROFILER.dump_trace()}")
+            self.profiler_next_refresh = 0.0
+        elif symbol in SCRUB_KEYS and self.client is None:
+            log = self.event_log
+            position = self.scrub if self.scrub is not None else len(log)
+            if symbol in (arcade.key.LEFT, arcade.key.RIGHT):
+                # A seed's EV_SEED events change nothing on the table, so they are stepped over
+                step = -1 if symbol == arcade.key.LEFT else 1
+                position += step
+                while log.seeding(position):
+                    position += step
+            elif symbol == arcade.key.HOME:
+                position = log.game_start(position)
+            else:
+                position = len(log)
+            self.scrub_to(position)
+        elif symbol == arcade.key.L and self.client is None:
+            print(f"Event log written to {self.event_log.save()}")
 
+    @PROFILER.timed("mouse_press")
     def on_mouse_press(self, x, y, button, modifiers):
-        pos = self.get_dynamic_positions()
+        self.needs_redraw = True
         # Card resizer slider logic
         if self.show_card_resizer:
             box_x, box_y = self.width // 2, self.height // 2
@@ -540,412 +735,308 @@ class DeckTestWindow(arcade.Window):
             max_scale = 0.45
             if slider_y - 20 < y < slider_y + 20 and slider_x < x < slider_x + slider_w:
                 rel = (x - slider_x) / slider_w
-                self.card_scale = min_scale + rel * (max_scale - min_scale)
-                self.card_scale = max(min_scale, min(self.card_scale, max_scale))
-                # Update all cards' scale
-                for card in self.deck:
-                    card.scale = self.card_scale
-                for card in self.movable_cards:
-                    card.scale = self.card_scale
-                for pile in self.player_piles:
-                    for card in pile:
-                        card.scale = self.card_scale
-                for card in self.discard_pile:  # <-- Add this line
-                    card.scale = self.card_scale
+                self.set_card_scale(max(min_scale, min(min_scale + rel * (max_scale - min_scale), max_scale)))
                 return
             # Don't interact with rest of UI while resizer is open
             return
 
+        # The table is locked while the computer players take their turns and during replay
+        if self.ai_seat is not None or self.live_game is not None:
+            return
+
+        targets = {hit.target for hit in self.static_hits.query_point(x, y)}
+
         # --- Hide dice if dice are clicked after rolling and not animating ---
         if (
             self.last_dice[0] is not None and self.last_dice[1] is not None
             and not self.rolling
+            and "dice_box" in targets
         ):
-            dice_size = 96
-            center_x = self.width // 2
-            center_y = self.height // 2
-            box_w = dice_size * 2 + 40
-            box_h = dice_size + 40
-            if (
-                center_x - box_w // 2 < x < center_x + box_w // 2
-                and center_y - box_h // 2 < y < center_y + box_h // 2
-            ):
-                self.last_dice = [None, None]
-                self.show_sabacc_shift = False
-                self.dice_result_text = ""
-                return
+            self.last_dice = [None, None]
+            self.show_sabacc_shift = False
+            self.dice_result_text = ""
+            return
 
         # --- Swap logic after discard ---
-        if self.swap_candidate:
-            pile_width = pos["pile_width"]
-            pile_height = pos["pile_height"]
-            if (
-                pos["discard_pile_x"] - pile_width // 2 < x < pos["discard_pile_x"] + pile_width // 2
-                and pos["discard_pile_y"] - pile_height // 2 < y < pos["discard_pile_y"] + pile_height // 2
-                and self.previous_discard_top is not None
-            ):
-                if self.previous_discard_top in self.discard_pile:
-                    self.discard_pile.remove(self.previous_discard_top)
-                self.movable_cards.append(self.previous_discard_top)
-                self.held_card = self.previous_discard_top
-                self.held_card_offset_x = 0
-                self.held_card_offset_y = 0
-                self.held_card_origin = "discard"
-                self.swap_candidate = False
-                self.previous_discard_top = None
+        game = self.game
+        if game.swap_candidate:
+            if "discard" in targets and game.previous_discard_top is not None:
+                card = game.take_discard()
+                if card is not None:
+                    sprite = self.sprite_for(card)
+                    self.movable_cards.append(sprite)
+                    self.held_card = sprite
+                    self.held_card_offset_x = 0
+                    self.held_card_offset_y = 0
+                    self.held_card_origin = "discard"
                 return
-            if (
-                pos["draw_pile_x"] - pile_width // 2 < x < pos["draw_pile_x"] + pile_width // 2
-                and pos["draw_pile_y"] - pile_height // 2 < y < pos["draw_pile_y"] + pile_height // 2
-                and len(self.deck) > 0
-            ):
-                card = self.deck.pop()
-                card.center_x = x
-                card.center_y = y
-                self.movable_cards.append(card)
-                self.held_card = card
+            if "draw_pile" in targets and len(game.deck) > 0:
+                sprite = self.sprite_for(game.draw())
+                sprite.center_x = x
+                sprite.center_y = y
+                self.movable_cards.append(sprite)
+                self.held_card = sprite
                 self.held_card_offset_x = 0
                 self.held_card_offset_y = 0
                 self.held_card_origin = "draw"
-                self.swap_candidate = False
-                self.previous_discard_top = None
                 return
-            self.swap_candidate = False
-            self.previous_discard_top = None
+            game.cancel_swap()
             return
 
         # Roll Dice button
-        if (
-            pos["dice_button_x"] - pos["dice_button_w"] // 2 < x < pos["dice_button_x"] + pos["dice_button_w"] // 2
-            and pos["dice_button_y"] - pos["dice_button_h"] // 2 < y < pos["dice_button_y"] + pos["dice_button_h"] // 2
-        ):
-            self.roll_dice_and_shift()
+        if "roll_dice" in targets:
+            self.start_ai_turns()
             return
 
         # Deal button
-        if (
-            pos["button_x"] - pos["button_width"] // 2 < x < pos["button_x"] + pos["button_width"] // 2
-            and pos["button_y"] - pos["button_height"] // 2 < y < pos["button_y"] + pos["button_height"] // 2
-            and not self.dealing
-        ):
+        if "deal" in targets and not self.dealing:
             self.start_deal_animation()
             return
-        # Try to pick up a movable card
-        for card in reversed(self.movable_cards):
-            if card.collides_with_point((x, y)):
-                self.held_card = card
-                self.held_card_offset_x = card.center_x - x
-                self.held_card_offset_y = card.center_y - y
+        # Try to pick up a movable card, or a card from any player hand
+        hit = self.card_at(x, y)
+        if hit is not None:
+            sprite = hit.target
+            self.held_card = sprite
+            self.held_card_offset_x = sprite.center_x - x
+            self.held_card_offset_y = sprite.center_y - y
+            if hit.zone == "table":
                 self.held_card_origin = "table"
-                return
-        # Try to pick up a card from any player hand
-        for i, pile in enumerate(self.player_piles):
-            for card in reversed(pile):
-                if card.collides_with_point((x, y)):
-                    self.held_card = card
-                    self.held_card_offset_x = card.center_x - x
-                    self.held_card_offset_y = card.center_y - y
-                    pile.remove(card)
-                    self.movable_cards.append(card)
-                    self.held_card_origin = "hand"
-                    return
+            else:
+                game.pick_up(sprite.card)
+                self.movable_cards.append(sprite)
+                self.held_card_origin = "hand"
+            return
         # Allow drawing from pile at any time (Gain)
-        pile_width = pos["pile_width"]
-        pile_height = pos["pile_height"]
         if (
-            self.held_card is None
-            and len(self.deck) > 0
+            "draw_pile" in targets
+            and self.held_card is None
+            and len(game.deck) > 0
             and not self.dealing
         ):
-            if (
-                pos["draw_pile_x"] - pile_width // 2 < x < pos["draw_pile_x"] + pile_width // 2
-                and pos["draw_pile_y"] - pile_height // 2 < y < pos["draw_pile_y"] + pile_height // 2
-            ):
-                card = self.deck.pop()
-                card.center_x = x
-                card.center_y = y
-                self.movable_cards.append(card)
-                self.held_card = card
-                self.held_card_offset_x = 0
-                self.held_card_offset_y = 0
-                self.held_card_origin = "draw"
+            sprite = self.sprite_for(game.draw())
+            sprite.center_x = x
+            sprite.center_y = y
+            self.movable_cards.append(sprite)
+            self.held_card = sprite
+            self.held_card_offset_x = 0
+            self.held_card_offset_y = 0
+            self.held_card_origin = "draw"
         # Reset button
-        if (
-            pos["reset_x"] - pos["reset_w"] // 2 < x < pos["reset_x"] + pos["reset_w"] // 2
-            and pos["reset_y"] - pos["reset_h"] // 2 < y < pos["reset_y"] + pos["reset_h"] // 2
-        ):
+        if "reset" in targets:
             self.reset_deck()
             return
 
         # --- Show Winner button logic ---
-        if (
-            (self.round > self.max_rounds or self.show_winner)
-            and pos["show_winner_button_x"] - pos["show_winner_button_w"] // 2 < x < pos["show_winner_button_x"] + pos["show_winner_button_w"] // 2
-            and pos["show_winner_button_y"] - pos["show_winner_button_h"] // 2 < y < pos["show_winner_button_y"] + pos["show_winner_button_h"] // 2
-        ):
+        if "show_winner" in targets and self.show_winner_button_visible():
             self.show_winner = True
             self.winner_text = self.get_winner_text()
             return
 
+    def start_ai_turns(self):
+        # Players 2-4 play their turns in order, then the dice end the round
+        game = self.game
+        # At a server table the other seats belong to other players
+        if (
+            self.client is not None or self.dealing or self.rolling or game.is_over
+            or not any(len(game.hands[p]) for p in AI_PLAYERS)
+        ):
+            self.roll_dice_and_shift()
+            return
+        self.ai_seat = AI_PLAYERS[0]
+        game.turn = self.ai_seat
+        game.gained = None
+        self.dice_result_text = ""
+        self.request_ai_move()
+
+    def request_ai_move(self):
+        if self.ai_executor is None:
+            # Spawned rather than forked so the worker doesn't inherit the window and GL context
+            self.ai_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        self.ai_wait = AI_MOVE_DELAY
+        try:
+            self.ai_future = self.ai_executor.submit(mcts.search, self.game.copy(), AI_TIME_BUDGET, random.random())
+        except concurrent.futures.BrokenExecutor as e:
+            # The worker died since the last move; ai_move falls back the same way
+            self.ai_future = concurrent.futures.Future()
+            self.ai_future.set_exception(e)
+
+    def ai_move(self):
+        # The searched move, or a greedy one worked out here if the search failed
+        try:
+            return self.ai_future.result()
+        except Exception as e:
+            print(f"Player {self.ai_seat + 1} search failed ({e!r}), playing greedy")
+            if isinstance(e, concurrent.futures.BrokenExecutor):
+                # The worker died; the next request starts a new one
+                self.ai_executor.shutdown(wait=False)
+                self.ai_executor = None
+            return strategies.greedy_strategy(self.game, self.ai_seat, self.game.rng)
+
+    def play_ai_move(self, action):
+        game = self.game
+        self.ai_future = None
+        if not game.act(action):
+            # Gained a card; the same player now keeps it or discards
+            self.request_ai_move()
+            return
+        game.gained = None
+        seat = AI_PLAYERS.index(self.ai_seat) + 1
+        if seat < len(AI_PLAYERS):
+            self.ai_seat = game.turn = AI_PLAYERS[seat]
+            self.request_ai_move()
+            return
+        self.ai_seat = None
+        game.turn = 0
+        self.roll_dice_and_shift()
+
     def roll_dice_and_shift(self):
-        # Start dice animation
+        # Start dice animation; the rules only see the result once it has finished
         self.rolling = True
-        self.roll_start_time = time.time()
-        self.roll_duration = random.uniform(1.0, 1.7)
-        self.roll_end_result = [random.randint(1, 6), random.randint(1, 6)]
-        self.roll_stop_times = [
-            self.roll_start_time + self.roll_duration + random.uniform(0, 0.2),
-            self.roll_start_time + self.roll_duration + random.uniform(0, 0.2)
-        ]
-        self.roll_intervals = [0.04, 0.04]
-        self.roll_next_update = [self.roll_start_time, self.roll_start_time]
-        self.last_dice = [random.randint(1, 6), random.randint(1, 6)]
+        self.dice_roll = dice.DiceRoll(self.game.roll_dice(), on_complete=self.on_dice_stopped)
+        self.last_dice = list(self.dice_roll.faces)
         self.show_sabacc_shift = False
         self.dice_result_text = ""
 
+    def on_dice_stopped(self, die1, die2):
+        self.rolling = False
+        self.dice_roll = None
+        self.last_dice = [die1, die2]
+        self.dice_result_text = f"Dice: {die1}, {die2}"
+        self.show_sabacc_shift = (die1 == die2)
+        # Only do Sabacc Shift logic after animation; the roll also advances the round.
+        # The new hands fly in from the draw pile together, like a deal.
+        shifted = self.game.resolve_roll(die1, die2)
+        if shifted:
+            self.animate_deal(shifted)
+
+    @PROFILER.timed("on_update")
     def on_update(self, delta_time):
+        self.poll_assets()
+        if self.client is not None:
+            self.sync_remote()
+        self.autosave(delta_time)
+
         # Animate dice rolling
-        if self.rolling:
-            now = time.time()
-            for i in range(2):
-                elapsed = now - self.roll_start_time
-                total = self.roll_stop_times[i] - self.roll_start_time
-                t = min(max(elapsed / total, 0), 1)
-                self.roll_intervals[i] = 0.04 + t * 0.18 * random.uniform(0.9, 1.1)
-                if now >= self.roll_stop_times[i]:
-                    self.last_dice[i] = self.roll_end_result[i]
-                elif now >= self.roll_next_update[i]:
-                    self.last_dice[i] = random.randint(1, 6)
-                    self.roll_next_update[i] = now + self.roll_intervals[i]
-            if now >= max(self.roll_stop_times):
-                self.rolling = False
-                die1, die2 = self.roll_end_result
-                self.dice_result_text = f"Dice: {die1}, {die2}"
-                self.show_sabacc_shift = (die1 == die2)
-                # Only do Sabacc Shift logic after animation
-                if die1 == die2:
-                    hand_sizes = []
-                    for pile in self.player_piles:
-                        hand_sizes.append(len(pile))
-                        while pile:
-                            card = pile.pop()
-                            self.discard_pile.append(card)
-                    for i, pile in enumerate(self.player_piles):
-                        num_cards = hand_sizes[i]
-                        for _ in range(num_cards):
-                            if len(self.deck) == 0:
-                                if self.discard_pile:
-                                    self.deck.extend(self.discard_pile)
-                                    self.discard_pile.clear()
-                                    random.shuffle(self.deck)
-                                else:
-                                    break
-                            if len(self.deck) > 0:
-                                card = self.deck.pop()
-                                card.center_x, card.center_y = self.get_dynamic_positions()["player_pile_positions"][i]
-                                pile.append(card)
-                # --- Advance round after dice roll ---
-                if self.round <= self.max_rounds:
-                    self.round += 1
+        if self.dice_roll is not None:
+            self.dice_roll.update(delta_time)
+            if self.dice_roll is not None:
+                self.last_dice = list(self.dice_roll.faces)
+
+        # --- Computer players ---
+        if self.ai_future is not None:
+            self.ai_wait -= delta_time
+            if self.ai_wait <= 0 and self.ai_future.done():
+                self.play_ai_move(self.ai_move())
 
         # --- Card dealing animation ---
-        if self.dealing and self.deal_queue:
-            card, player = self.deal_queue[0]
-            dx = card.target_x - card.center_x
-            dy = card.target_y - card.center_y
-            dist = math.hypot(dx, dy)
-            if dist < card.deal_speed:
-                card.center_x = card.target_x
-                card.center_y = card.target_y
-                card.angle = 0
-                card.dealing = False
-                self.player_piles[player].append(card)
-                self.deal_queue.pop(0)
-            else:
-                card.center_x += math.cos(card.deal_angle) * card.deal_speed
-                card.center_y += math.sin(card.deal_angle) * card.deal_speed
-                card.angle += card.deal_spin
-        elif self.dealing and not self.deal_queue:
-            self.dealing = False
+        if self.dealing:
+            self.deal_tweens.update(delta_time)
+            if not self.deal_tweens.active:
+                self.dealing = False
+
+        # --- Redraw on change ---
+        if self.dealing or self.dice_roll is not None or PROFILER.enabled or self.frame_key() != self.drawn_key:
+            self.needs_redraw = True
 
+    def on_card_landed(self, sprite):
+        sprite.dealing = False
+        self.zones_key = None  # Snap the landed card into its hand slot
+        self.card_moves += 1
+
+    @PROFILER.timed("mouse_release")
     def on_mouse_release(self, x, y, button, modifiers):
+        # A held card is always one of the movable cards: every way of picking one up adds it
+        self.needs_redraw = True
         pos = self.get_dynamic_positions()
         if self.held_card:
             card = self.held_card
+            card_rect = sprite_rect(card)
             card_area = card.width * card.height
-            snapped = False
-
-            # --- Discard pile logic (use original pile size) ---
-            pile_width = pos["pile_width"]
-            pile_height = pos["pile_height"]
-            pile_left = pos["discard_pile_x"] - pile_width // 2
-            pile_right = pos["discard_pile_x"] + pile_width // 2
-            pile_bottom = pos["discard_pile_y"] - pile_height // 2
-            pile_top = pos["discard_pile_y"] + pile_height // 2
-            overlap_left = max(card.left, pile_left)
-            overlap_right = min(card.right, pile_right)
-            overlap_bottom = max(card.bottom, pile_bottom)
-            overlap_top = min(card.top, pile_top)
-            if (
-                overlap_right > overlap_left and overlap_top > overlap_bottom
-                and self.held_card_origin != "discard"
-            ):
-                overlap_area = (overlap_right - overlap_left) * (overlap_top - overlap_bottom)
-                if overlap_area > 0.5 * card_area:
-                    if self.discard_pile:
-                        self.previous_discard_top = self.discard_pile[-1]
-                    else:
-                        self.previous_discard_top = None
-                    card.center_x = pos["discard_pile_x"]
-                    card.center_y = pos["discard_pile_y"]
+            self.card_moves += 1
+
+            # Discard pile uses the original pile size, player piles the expanded boxes;
+            # zones come back in insertion order, so the discard pile is checked first
+            for hit in self.static_hits.query_rect(card_rect):
+                if hit.rect.overlap_area(card_rect) <= 0.5 * card_area:
+                    continue
+                if hit.target == "discard" and self.held_card_origin != "discard":
+                    card.center_x = pos.discard_pile_x
+                    card.center_y = pos.discard_pile_y
                     card.angle = 0
-                    self.discard_pile.append(card)
-                    if card in self.movable_cards:
-                        self.movable_cards.remove(card)
-                    for pile in self.player_piles:
-                        if card in pile:
-                            pile.remove(card)
-                    self.swap_candidate = len(self.discard_pile) > 1
-                    self.last_discarded_card = card
-                    snapped = True
-            if snapped:
-                self.held_card = None
-                self.held_card_origin = None
-                return
-
-            # --- Player pile logic (use expanded box) ---
-            player_box_width = pos["player_box_width"]
-            player_box_height = pos["player_box_height"]
-            for i, pile in enumerate(self.player_piles):
-                px, py = pos["player_pile_positions"][i]
-                pile_left = px - player_box_width // 2
-                pile_right = px + player_box_width // 2
-                pile_bottom = py - player_box_height // 2
-                pile_top = py + player_box_height // 2
-                overlap_left = max(card.left, pile_left)
-                overlap_right = min(card.right, pile_right)
-                overlap_bottom = max(card.bottom, pile_bottom)
-                overlap_top = min(card.top, pile_top)
-                if overlap_right > overlap_left and overlap_top > overlap_bottom:
-                    overlap_area = (overlap_right - overlap_left) * (overlap_top - overlap_bottom)
-                    if overlap_area > 0.5 * card_area:
-                        idx = len(self.player_piles[i])
-                        card.center_x, card.center_y = pos["player_pile_positions"][i]
-                        card.center_x += idx * (pos["pile_width"] // 2) - (pos["pile_width"] // 4)
-                        card.angle = 0
-                        self.player_piles[i].append(card)
-                        if card in self.movable_cards:
-                            self.movable_cards.remove(card)
-                        snapped = True
-                        break
+                    self.game.discard_card(card.card)
+                    self.movable_cards.remove(card)
+                    break
+                if isinstance(hit.target, tuple):
+                    i = hit.target[1]
+                    idx = len(self.game.hands[i])
+                    card.center_x, card.center_y = pos.player_pile_positions[i]
+                    card.center_x += idx * (pos.pile_width // 2) - (pos.pile_width // 4)
+                    card.angle = 0
+                    self.game.move_to_hand(card.card, i)
+                    self.movable_cards.remove(card)
+                    break
             self.held_card = None
             self.held_card_origin = None
 
+    @PROFILER.timed("mouse_drag")
     def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
         if self.held_card:
+            self.needs_redraw = True
             self.held_card.center_x = x + self.held_card_offset_x
             self.held_card.center_y = y + self.held_card_offset_y
 
     def start_deal_animation(self):
-        pos = self.get_dynamic_positions()
-        self.deal_queue = []
+        # The engine deals 2 cards each at the start of a game, else 1 card each
+        self.animate_deal(self.game.deal())
 
-        # If all hands are empty, deal 2 cards (start of game), else deal 1 card to each
-        if all(len(pile) == 0 for pile in self.player_piles):
-            rounds = 2
-        else:
-            rounds = 1
-
-        for round in range(rounds):
-            for player in range(4):
-                if len(self.deck) > 0:
-                    card = self.deck.pop()
-                    card.center_x = pos["draw_pile_x"]
-                    card.center_y = pos["draw_pile_y"]
-                    card.angle = 0
-                    card.dealing = True
-                    card.target_x, card.target_y = pos["player_pile_positions"][player]
-                    card.target_x += (len(self.player_piles[player]) + round) * (pos["pile_width"] // 2) - (pos["pile_width"] // 4)
-                    card.deal_angle = math.atan2(card.target_y - card.center_y, card.target_x - card.center_x)
-                    card.deal_speed = 30
-                    card.deal_spin = random.choice([-10, 10])
-                    self.deal_queue.append((card, player))
+    def animate_deal(self, dealt):
+        # Flies the dealt (card, player) pairs from the draw pile to their hand slots as one batch;
+        # the cards are already in the hands and only fly there visually
+        pos = self.get_dynamic_positions()
+        hands = self.game.hands
+        sprites = []
+        targets = []
+        for card, player in dealt:
+            sprite = self.sprite_for(card)
+            sprite.center_x = pos.draw_pile_x
+            sprite.center_y = pos.draw_pile_y
+            sprite.angle = 0
+            sprite.dealing = True
+            idx = hands[player].index(card)
+            target_x, target_y = pos.player_pile_positions[player]
+            targets.append((target_x + idx * (pos.pile_width // 2) - (pos.pile_width // 4), target_y))
+            sprites.append(sprite)
+        # All cards fly at once with staggered starts, so the deal takes a fixed time
+        spins = [random.choice([-DEAL_SPIN, DEAL_SPIN]) for _ in sprites]
+        self.deal_tweens.add_many(sprites, targets, stagger(len(sprites)), spins=spins)
         self.dealing = True
-        self.deal_timer = 0
 
     def get_winner_text(self):
         # Returns a string announcing the winner(s) according to Sabacc rules
-        best_score = None
-        best_player = []
-        best_is_pure_sabacc = False
-        best_is_sabacc = False
-        best_card_count = None
-
-        for i, hand in enumerate(self.player_piles):
-            # Check for Pure Sabacc (two sylops)
-            sylop_zeros = [card for card in hand if card.card_value == "0" and card.card_suit == " Sylop"]
-            if len(sylop_zeros) == 2:
-                # Pure Sabacc beats everything
-                if not best_is_pure_sabacc:
-                    best_player = [i]
-                    best_is_pure_sabacc = True
-                else:
-                    best_player.append(i)
-                continue
-            if best_is_pure_sabacc:
-                continue  # Only compare Pure Sabacc hands
-
-            # Check for Sabacc (total 0)
-            score = sum(self.get_card_value(card) for card in hand)
-            if score == 0 and len(hand) > 0:
-                if not best_is_sabacc:
-                    best_player = [i]
-                    best_is_sabacc = True
-                    best_card_count = len(hand)
-                elif len(hand) < best_card_count:
-                    best_player = [i]
-                    best_card_count = len(hand)
-                elif len(hand) == best_card_count:
-                    best_player.append(i)
-                continue
-            if best_is_sabacc:
-                continue  # Only compare Sabacc hands
-
-            # Otherwise, closest to zero, favoring positive values
-            abs_score = abs(score)
-            is_positive = score >= 0
-            if best_score is None:
-                best_score = (abs_score, not is_positive)  # not is_positive: False < True, so positive wins ties
-                best_player = [i]
-            else:
-                if (abs_score, not is_positive) < best_score:
-                    best_score = (abs_score, not is_positive)
-                    best_player = [i]
-                elif (abs_score, not is_positive) == best_score:
-                    best_player.append(i)
-
-        if best_is_pure_sabacc:
-            if len(best_player) == 1:
-                return f"Player {best_player[0]+1} wins with Pure Sabacc!"
-            else:
-                return f"Players {', '.join(str(p+1) for p in best_player)} tie with Pure Sabacc!"
-        elif best_is_sabacc:
-            if len(best_player) == 1:
-                return f"Player {best_player[0]+1} wins with Sabacc!"
-            else:
-                return f"Players {', '.join(str(p+1) for p in best_player)} tie with Sabacc!"
-        else:
-            if len(best_player) == 1:
-                hand = self.player_piles[best_player[0]]
-                score = sum(self.get_card_value(card) for card in hand)
-                return f"Player {best_player[0]+1} wins with {score:+d}!"
-            else:
-                scores = [sum(self.get_card_value(card) for card in self.player_piles[p]) for p in best_player]
-                return f"Players {', '.join(str(p+1) for p in best_player)} tie with {', '.join(str(s) for s in scores)}!"
+        return self.game.winner_text()
 
 def main():
-    window = DeckTestWindow()
+    parser = argparse.ArgumentParser(description="Sabacc table.")
+    parser.add_argument("--connect", metavar="HOST[:PORT]", help="play at a table on a server.py server")
+    parser.add_argument("--table", default="default", help="server table to join")
+    parser.add_argument("--resume", action="store_true", help=f"continue the table saved in {AUTOSAVE_FILE}")
+    parser.add_argument("--always-redraw", action="store_true", help="draw every frame even when nothing changed")
+    args = parser.parse_args()
+    if args.resume and args.connect:
+        parser.error("--resume only applies to a local table")
+    client = None
+    if args.connect:
+        host, _, port = args.connect.partition(":")
+        client = netclient.TableClient(host, int(port or protocol.DEFAULT_PORT), args.table)
+    window = DeckTestWindow(client)
+    window.always_redraw = args.always_redraw
     window.setup()
+    if args.resume and os.path.exists(AUTOSAVE_FILE):
+        with open(AUTOSAVE_FILE, "rb") as f:
+            window.restore_table(f.read())
+    window.autosave_enabled = True
     arcade.run()
 
 if __name__ == "__main__":
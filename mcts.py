@@ -0,0 +1,122 @@
+import math
+import random
+import time
+
+import engine
+import strategies
+
+# Determinized Monte Carlo tree search for bot players. Every iteration deals the cards the
+# searching player can't see (the deck and the other hands) at random, walks one shared tree
+# restricted to the actions legal in that deal, plays the game out and backs up the result.
+# Search stops at its time budget, so a decision never takes much longer than asked.
+
+TIME_BUDGET = 0.05
+EXPLORATION = 0.7
+
+
+class Node:
+    __slots__ = ("parent", "action", "player", "children", "visits", "reward", "available")
+
+    def __init__(self, parent=None, action=None, player=None):
+        self.parent = parent
+        self.action = action
+        self.player = player  # Who took the action leading here
+        self.children = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.available = 0
+
+    def select(self, actions):
+        # UCB over the children legal in this determinization
+        best = None
+        best_value = -1.0
+        for action in actions:
+            child = self.children[action]
+            child.available += 1
+            value = child.reward / child.visits + EXPLORATION * math.sqrt(math.log(child.available) / child.visits)
+            if value > best_value:
+                best = child
+                best_value = value
+        return best
+
+
+def determinize(checkpoint, player, rng):
+    # The game saved in checkpoint (a Game.snapshot) with the cards hidden from player redealt at random
+    state = engine.Game.from_snapshot(checkpoint, rng.random())
+    hidden = bytearray(state.deck)
+    for other, hand in enumerate(state.hands):
+        if other != player:
+            hidden += hand.cards
+    rng.shuffle(hidden)
+    start = 0
+    for other, hand in enumerate(state.hands):
+        if other != player:
+            size = len(hand)
+            state.hands[other] = engine.Hand(hidden[start:start + size])
+            start += size
+    state.deck = hidden[start:]
+    state.reindex()
+    return state
+
+
+def rewards(game):
+    # Winners share one point
+    _, winners = engine.find_winners(game.hands)
+    share = 1.0 / len(winners)
+    return {player: share for player in winners}
+
+
+def search(game, time_budget=TIME_BUDGET, seed=None, rollout=strategies.greedy_strategy, max_iterations=None):
+    # Returns the best action for the player whose turn it is in game
+    deadline = time.perf_counter() + time_budget
+    rng = random.Random(seed)
+    player = game.turn
+    actions = game.legal_actions()
+    if len(actions) == 1:
+        return actions[0]
+    # Every iteration branches from this snapshot, which restores faster than copying the game
+    checkpoint = game.snapshot()
+    root = Node()
+    iterations = 0
+    while time.perf_counter() < deadline and (max_iterations is None or iterations < max_iterations):
+        iterations += 1
+        state = determinize(checkpoint, player, rng)
+        node = root
+
+        # Selection and expansion
+        while not state.is_over:
+            legal = state.legal_actions()
+            untried = [action for action in legal if action not in node.children]
+            if untried:
+                action = rng.choice(untried)
+                for other in legal:
+                    if other in node.children:
+                        node.children[other].available += 1
+                child = Node(node, action, state.turn)
+                child.available = 1
+                node.children[action] = child
+                state.play(action)
+                node = child
+                break
+            node = node.select(legal)
+            state.play(node.action)
+
+        # Playout
+        while not state.is_over:
+            state.play(rollout(state, state.turn, rng))
+
+        # Backpropagation
+        result = rewards(state)
+        while node is not root:
+            node.visits += 1
+            node.reward += result.get(node.player, 0.0)
+            node = node.parent
+
+    return max(root.children.values(), key=lambda child: child.visits).action if root.children else actions[0]
+
+
+def mcts_strategy(game, player, rng):
+    return search(game, seed=rng.random())
+
+
+strategies.register("mcts", mcts_strategy)
@@ -0,0 +1,124 @@
+import functools
+import queue
+import socket
+import threading
+
+import engine
+import protocol
+
+# Client side of the table server, used by the window when it is started with --connect.
+# A reader thread queues incoming messages; the window drains them from on_update.
+
+
+class TableClient:
+    def __init__(self, host, port, table):
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.inbox = queue.SimpleQueue()
+        self.connected = True
+        threading.Thread(target=self._read, daemon=True, name="table-client").start()
+        self.send({"op": "join", "table": table})
+
+    def _read(self):
+        with self.sock.makefile("rb") as lines:
+            for line in lines:
+                self.inbox.put(protocol.decode(line))
+        self.connected = False
+
+    def send(self, message):
+        self.sock.sendall(protocol.encode(message))
+
+    def poll(self):
+        messages = []
+        while True:
+            try:
+                messages.append(self.inbox.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def close(self):
+        self.sock.close()
+
+
+def remote(op, *names):
+    # Sends the outermost call of a Game method as op, with its arguments under names,
+    # after seeding the RNG the way the server will for that action
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            if self.client is None or self.depth:
+                return method(self, *args)
+            self.depth += 1
+            try:
+                self.outstanding += 1
+                if op != "roll":
+                    self.rng.seed(protocol.action_seed(self.seed, self.seq + self.outstanding))
+                message = {"op": op}
+                message.update(zip(names, args))
+                self.client.send(message)
+                return method(self, *args)
+            finally:
+                self.depth -= 1
+        return wrapper
+    return decorate
+
+
+class RemoteGame(engine.Game):
+    # A local game mirroring one server table. Actions apply locally straight away so the
+    # table never waits on a round trip, and are sent to the server, whose state always wins:
+    # once every action sent has been answered the whole local state is overwritten with it.
+    def __init__(self, client):
+        self.client = None
+        self.seed = 0
+        self.seq = 0
+        self.you = None
+        self.outstanding = 0
+        self.depth = 0
+        self.server_state = {}
+        self.stale = set()
+        super().__init__()
+        self.client = client
+
+    def sync(self):
+        # Applies what the server sent since the last call; returns the changed field names
+        for message in self.client.poll():
+            op = message["op"]
+            if op == "state":
+                self.seed = message["seed"]
+                self.seq = message["seq"]
+                self.you = message["you"]
+                self.server_state = message["state"]
+                self.stale.update(self.server_state)
+            elif op == "delta":
+                self.seq = message["seq"]
+                if message["by"] == self.you:
+                    self.outstanding -= 1
+                self.server_state.update(message["changes"])
+                self.stale.update(message["changes"])
+            elif op == "error":
+                # The local game applied an action the server refused
+                self.outstanding -= 1
+                self.stale.update(self.server_state)
+                print(f"Server: {message['message']}")
+        if self.outstanding > 0 or not self.stale:
+            return set()
+        changed = self.stale
+        self.stale = set()
+        protocol.apply_state(self, self.server_state)
+        return changed
+
+    def roll_dice(self):
+        # The roll is the next action, so the server rolls the same dice
+        if self.client is not None:
+            self.rng.seed(protocol.action_seed(self.seed, self.seq + self.outstanding + 1))
+        return super().roll_dice()
+
+    reset = remote("reset")(engine.Game.reset)
+    deal = remote("deal")(engine.Game.deal)
+    draw = remote("gain")(engine.Game.draw)
+    take_discard = remote("swap")(engine.Game.take_discard)
+    cancel_swap = remote("cancel_swap")(engine.Game.cancel_swap)
+    pick_up = remote("pick_up", "card")(engine.Game.pick_up)
+    move_to_hand = remote("move", "card", "player")(engine.Game.move_to_hand)
+    discard_card = remote("discard", "card")(engine.Game.discard_card)
+    resolve_roll = remote("roll")(engine.Game.resolve_roll)
@@ -0,0 +1,102 @@
+import functools
+import json
+import time
+from collections import deque
+
+# Frame profiler for the table window, toggled with O. While enabled it keeps rolling timings
+# of on_draw sections, on_update, the mouse handlers and texture loads, and records every
+# timing as a trace event that is written out in Chrome trace format when it is switched off.
+
+HISTORY = 240  # Samples per timer used for the rolling percentiles
+TRACE_LIMIT = 200000  # Most recent trace events kept
+TRACE_FILE = "frame_trace.json"
+
+
+class FrameProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.samples = {}
+        self.trace = deque(maxlen=TRACE_LIMIT)
+        self.origin = time.perf_counter()
+        self.frame_start = None
+        self.lap_start = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.samples.clear()
+            self.trace.clear()
+            self.frame_start = None
+        return self.enabled
+
+    def record(self, name, start, end):
+        if not self.enabled:
+            return
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=HISTORY)
+        samples.append(end - start)
+        self.trace.append((name, start, end - start))
+
+    def begin_frame(self):
+        # Call at the top of on_draw; the time since the previous call is the frame time
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.record("frame", self.frame_start, now)
+        self.frame_start = now
+        self.lap_start = now
+
+    def lap(self, name):
+        # Times the on_draw section that ends here
+        if not self.enabled or self.lap_start is None:
+            return
+        now = time.perf_counter()
+        self.record(name, self.lap_start, now)
+        self.lap_start = now
+
+    def end_frame(self):
+        if self.enabled and self.frame_start is not None:
+            self.record("on_draw", self.frame_start, time.perf_counter())
+
+    def timed(self, name):
+        # Decorator timing every call of a handler while the profiler is on
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, start, time.perf_counter())
+            return wrapper
+        return decorate
+
+    def percentiles(self, name):
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return None, None
+        return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+    def report_lines(self):
+        lines = ["Profiler (O closes, saves trace)", f"{'':<14}{'p50 ms':>9}{'p99 ms':>9}"]
+        for name in self.samples:
+            p50, p99 = self.percentiles(name)
+            lines.append(f"{name:<14}{p50 * 1e3:>9.2f}{p99 * 1e3:>9.2f}")
+        return lines
+
+    def dump_trace(self, path=TRACE_FILE):
+        events = [
+            {"name": name, "ph": "X", "ts": (start - self.origin) * 1e6, "dur": duration * 1e6, "pid": 0, "tid": 0}
+            for name, start, duration in self.trace
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events}, f)
+        return path
+
+
+# Shared by the window and the texture loader
+PROFILER = FrameProfiler()
@@ -0,0 +1,78 @@
+import json
+
+import engine
+
+# Wire format shared by the table server and its clients: one compact JSON object per line.
+# Zones travel as hex strings of card ids, and after the first full state only the fields
+# that changed are sent.
+
+DEFAULT_PORT = 8765
+
+# Protocol action -> engine.Game method. "roll" rolls and resolves the dice on the server.
+ACTIONS = {
+    "reset": "reset",
+    "deal": "deal",
+    "gain": "draw",
+    "swap": "take_discard",
+    "cancel_swap": "cancel_swap",
+    "pick_up": "pick_up",
+    "move": "move_to_hand",
+    "discard": "discard_card",
+    "roll": "resolve_roll",
+}
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+def decode(line):
+    return json.loads(line)
+
+
+def action_seed(table_seed, seq):
+    # The engine RNG is reseeded before every action, so a client that applies its own action
+    # locally with the same seq rolls and shuffles exactly like the server
+    return table_seed * 1000003 + seq
+
+
+def encode_state(game):
+    state = {
+        "deck": game.deck.hex(),
+        "table": game.table.hex(),
+        "discard": game.discard.hex(),
+        "round": game.round,
+        "dice": list(game.last_dice) if game.last_dice else None,
+        "swap": [game.swap_candidate, game.previous_discard_top, game.last_discarded],
+        "winner": game.winner_text() if game.is_over else None,
+    }
+    for player, hand in enumerate(game.hands):
+        state[f"hand{player}"] = hand.cards.hex()
+        state[f"score{player}"] = hand.score
+    return state
+
+
+def diff(old, new):
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+def apply_state(game, state):
+    # Writes a full or partial encoded state into game
+    if "deck" in state:
+        game.deck = bytearray.fromhex(state["deck"])
+    if "table" in state:
+        game.table = bytearray.fromhex(state["table"])
+    if "discard" in state:
+        game.discard = bytearray.fromhex(state["discard"])
+    if "round" in state:
+        game.round = state["round"]
+    if "dice" in state:
+        game.last_dice = tuple(state["dice"]) if state["dice"] else None
+    if "swap" in state:
+        game.swap_candidate, game.previous_discard_top, game.last_discarded = state["swap"]
+    for player in range(game.num_players):
+        cards = state.get(f"hand{player}")
+        if cards is not None:
+            game.hands[player] = engine.Hand(bytes.fromhex(cards))
+    game.reindex()
+    game.version += 1
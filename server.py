@@ -0,0 +1,167 @@
+import argparse
+import asyncio
+import itertools
+import random
+
+import engine
+import protocol
+
+# Multiplayer table server. Every table is an engine.Game driven by the messages of the
+# clients sitting at it; all tables share one asyncio event loop and no table owns a thread.
+#
+# Client -> server: {"op": "join", "table": name}, then actions such as
+#   {"op": "deal"}, {"op": "gain"}, {"op": "move", "card": 7, "player": 0},
+#   {"op": "discard", "card": 7}, {"op": "swap"}, {"op": "roll"}
+# Server -> client: {"op": "state", "seq", "seed", "you", "state"} on join, then
+#   {"op": "delta", "seq", "by", "changes"} to everyone at the table after each action,
+#   or {"op": "error", "message"} to the sender. "by" is the id of the acting connection.
+
+
+LISTEN_BACKLOG = 1024  # Lets thousands of clients connect at once
+MAX_CLIENT_BACKLOG = 1 << 20  # Bytes queued for a client that isn't reading before it is dropped
+
+
+class TableError(Exception):
+    pass
+
+
+class Table:
+    def __init__(self, name, seed):
+        self.name = name
+        self.seed = seed
+        self.seq = 0
+        self.game = engine.Game(seed=seed)
+        self.state = protocol.encode_state(self.game)
+        self.clients = set()
+
+    def _check_card(self, card):
+        game = self.game
+        if not isinstance(card, int) or isinstance(card, bool) or not 0 <= card < engine.DECK_SIZE:
+            raise TableError(f"bad card {card!r}")
+        if game.in_zone(card, engine.DECK_ZONE):
+            raise TableError("card is still in the deck")
+
+    def apply(self, op, message):
+        # Runs one action and returns the changed fields, or raises TableError
+        game = self.game
+        method = protocol.ACTIONS.get(op)
+        if method is None:
+            raise TableError(f"unknown action {op!r}")
+        args = ()
+        if op in ("move", "pick_up", "discard"):
+            card = message.get("card")
+            self._check_card(card)
+            args = (card,)
+            if op == "move":
+                player = message.get("player")
+                if not isinstance(player, int) or isinstance(player, bool) or not 0 <= player < game.num_players:
+                    raise TableError(f"bad player {player!r}")
+                args = (card, player)
+        elif op == "gain" and not game.deck:
+            raise TableError("the deck is empty")
+        self.seq += 1
+        game.rng.seed(protocol.action_seed(self.seed, self.seq))
+        if op == "roll":
+            args = game.roll_dice()
+        getattr(game, method)(*args)
+        state = protocol.encode_state(game)
+        changes = protocol.diff(self.state, state)
+        self.state = state
+        return changes
+
+
+class TableServer:
+    def __init__(self, seed=None):
+        self.tables = {}
+        self.rng = random.Random(seed)
+        self.client_ids = itertools.count(1)
+
+    def table(self, name):
+        table = self.tables.get(name)
+        if table is None:
+            table = self.tables[name] = Table(name, self.rng.getrandbits(32))
+        return table
+
+    def broadcast(self, table, data):
+        # Only the sender is drained; anyone else at the table whose unsent backlog grows past
+        # MAX_CLIENT_BACKLOG is disconnected rather than buffered for without limit
+        for client in list(table.clients):
+            if client.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                table.clients.discard(client)
+                # Aborted, as closing would still wait to flush the backlog it isn't reading
+                client.transport.abort()
+            else:
+                client.write(data)
+
+    async def handle_client(self, reader, writer):
+        table = None
+        client_id = next(self.client_ids)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Longer than the stream limit; no client sends lines anywhere near it
+                    writer.write(protocol.encode({"op": "error", "message": "message too long"}))
+                    break
+                if not line:
+                    break
+                try:
+                    message = protocol.decode(line)
+                    op = message["op"]
+                    if not isinstance(op, str):
+                        raise TypeError(op)
+                except (ValueError, KeyError, TypeError):
+                    writer.write(protocol.encode({"op": "error", "message": "malformed message"}))
+                    continue
+                if op == "join":
+                    if table is not None:
+                        table.clients.discard(writer)
+                    table = self.table(str(message.get("table", "default")))
+                    table.clients.add(writer)
+                    writer.write(protocol.encode(
+                        {"op": "state", "seq": table.seq, "seed": table.seed, "you": client_id, "state": table.state}
+                    ))
+                elif table is None:
+                    writer.write(protocol.encode({"op": "error", "message": "join a table first"}))
+                else:
+                    try:
+                        changes = table.apply(op, message)
+                    except TableError as e:
+                        writer.write(protocol.encode({"op": "error", "message": str(e)}))
+                    else:
+                        self.broadcast(table, protocol.encode(
+                            {"op": "delta", "seq": table.seq, "by": client_id, "changes": changes}
+                        ))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if table is not None:
+                table.clients.discard(writer)
+                if not table.clients:
+                    # Tables nobody sits at are dropped
+                    self.tables.pop(table.name, None)
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_client, host, port, backlog=LISTEN_BACKLOG)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host Sabacc tables for network clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=protocol.DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    print(f"Serving tables on {args.host}:{args.port}")
+    try:
+        asyncio.run(TableServer(args.seed).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import engine
+import handrank
+from engine import CARD_SYLOP, CARD_VALUE, DISCARD, GAIN, KEEP, STAND, SWAP
+
+# Bot strategies. A strategy is a function (game, player, rng) -> action, called whenever it
+# is that player's turn to act; it must return one of game.legal_actions().
+
+# Greedy players gain while their best known hand is further from zero than this
+GAIN_THRESHOLD = 3
+
+
+def random_strategy(game, player, rng):
+    return rng.choice(game.legal_actions())
+
+
+def stand_strategy(game, player, rng):
+    return (KEEP, None) if game.gained is not None else (STAND, None)
+
+
+def action_key(game, player, action):
+    # Rank key of the player's hand after an action whose outcome is known
+    hand = game.hands[player]
+    kind, card = action
+    total, sylops, count = hand.total, hand.sylops, len(hand)
+    if kind in (DISCARD, SWAP):
+        total -= CARD_VALUE[card]
+        sylops -= CARD_SYLOP[card]
+        count -= 1
+    if kind == SWAP:
+        top = game.discard[-1]
+        total += CARD_VALUE[top]
+        sylops += CARD_SYLOP[top]
+        count += 1
+    return handrank.rank_key(total, sylops, count)
+
+
+def greedy_strategy(game, player, rng):
+    # Best known outcome for this turn; draw instead when even that is far from zero
+    known = [action for action in game.legal_actions() if action[0] != GAIN]
+    best = max(known, key=lambda action: action_key(game, player, action))
+    if game.gained is None and game.deck:
+        threshold = handrank.rank_key(GAIN_THRESHOLD, 0, 1)
+        if action_key(game, player, best) < threshold:
+            return (GAIN, None)
+    return best
+
+
+STRATEGIES = {
+    "random": random_strategy,
+    "stand": stand_strategy,
+    "greedy": greedy_strategy,
+}
+
+
+def register(name, strategy):
+    STRATEGIES[name] = strategy
+
+
+def get_strategy(name):
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy {name!r}, expected one of {', '.join(STRATEGIES)}") from None
+
+
+def play_game(strategies, seed=None, max_rounds=engine.MAX_ROUNDS):
+    # Plays one full game between the given strategies, one per seat.
+    # Returns (kind, winning seats) as engine.find_winners does.
+    game = engine.Game(len(strategies), max_rounds, seed=seed)
+    game.deal()
+    rng = game.rng
+    while not game.is_over:
+        player = game.turn
+        game.play(strategies[player](game, player, rng))
+    return engine.find_winners(game.hands)
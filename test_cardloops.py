@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import cardloops
+import engine
+
+
+@pytest.mark.parametrize("n_players, cards_per_hand", [(2, 2), (2, 7), (6, 10), (1, 62)])
+def test_hand_keys_match_engine(n_players, cards_per_hand):
+    dealt = cardloops.deal_hands(np.random.default_rng(1), 50, n_players, cards_per_hand)
+    totals, keys = cardloops.hand_keys(dealt)
+    for game in range(dealt.shape[2]):
+        for player in range(n_players):
+            hand = engine.Hand(int(card) for card in dealt[:, player, game])
+            assert totals[player, game] == hand.total
+            assert keys[player, game] == hand.rank_key
+
+
+@pytest.mark.parametrize("n_players, cards_per_hand", [(2, 7), (6, 10), (1, 62)])
+def test_simulate_large_hands(n_players, cards_per_hand):
+    results = cardloops.simulate(10, n_players, cards_per_hand, seed=1)
+    assert (results["wins"] + results["ties"]).sum() >= 10
+    assert sum(results["score_distribution"].values()) == pytest.approx(1)
+
+
+def test_simulate_whole_deck_is_pure_sabacc():
+    results = cardloops.simulate(10, 1, 62, seed=1)
+    assert results["pure_sabacc_rate"] == 1
+    assert results["score_distribution"] == {0: 1.0}
+
+
+@pytest.mark.parametrize("n_games, n_players, cards_per_hand", [(0, 2, 2), (-1, 2, 2), (10, 0, 2), (10, 2, 0)])
+def test_simulate_rejects_no_games(n_games, n_players, cards_per_hand):
+    with pytest.raises(ValueError):
+        cardloops.simulate(n_games, n_players, cards_per_hand)
+
+
+def test_simulate_rejects_too_many_cards():
+    with pytest.raises(ValueError):
+        cardloops.simulate(10, 7, 10)
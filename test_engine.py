@@ -0,0 +1,155 @@
+import random
+
+import pytest
+
+import engine
+import eventlog
+import protocol
+from engine import PURE_SABACC, SABACC
+
+
+def card(value, suit=0):
+    # Card id of value in suit; 0 is a sylop
+    if value == 0:
+        return engine.DECK_SIZE - engine.SYLOP_COUNT + suit
+    return suit * len(engine.CARD_VALUES) + engine.CARD_VALUES.index(value)
+
+
+def hand(*values):
+    # Suits are spread so the same value can appear more than once
+    seen = {}
+    cards = []
+    for value in values:
+        suit = seen[value] = seen.get(value, -1) + 1
+        cards.append(card(value, suit))
+    return cards
+
+
+@pytest.mark.parametrize("hands, kind, players", [
+    # Pure Sabacc beats every other hand
+    ([hand(0, 0), hand(1, -1)], PURE_SABACC, [0]),
+    ([hand(5, -5), hand(0, 0, 3)], PURE_SABACC, [1]),
+    # Sabacc beats any non-zero total, and fewer cards beat more
+    ([hand(1), hand(4, -4)], SABACC, [1]),
+    ([hand(2, -1, -1), hand(6, -6)], SABACC, [1]),
+    ([hand(0), hand(3, -3)], SABACC, [0]),
+    ([hand(3, -3), hand(7, -7)], SABACC, [0, 1]),
+    # Otherwise the total closest to zero wins, positive before negative
+    ([hand(5), hand(-2), hand(3)], None, [1]),
+    ([hand(-3), hand(3)], None, [1]),
+    ([hand(4, -1), hand(1, 2)], None, [0, 1]),
+    # An empty hand totals 0 but isn't Sabacc
+    ([hand(), hand(1)], None, [0]),
+])
+def test_find_winners(hands, kind, players):
+    assert engine.find_winners(hands) == (kind, players)
+
+
+@pytest.mark.parametrize("hands, text", [
+    ([hand(0, 0), hand(1, -1)], "Player 1 wins with Pure Sabacc!"),
+    ([hand(0, 0), hand(0, 0)], "Players 1, 2 tie with Pure Sabacc!"),
+    ([hand(9), hand(2, -2)], "Player 2 wins with Sabacc!"),
+    ([hand(3, -3), hand(8), hand(7, -7)], "Players 1, 3 tie with Sabacc!"),
+    ([hand(-2), hand(5)], "Player 1 wins with -2!"),
+    ([hand(-3), hand(3)], "Player 2 wins with +3!"),
+    ([hand(6), hand(2, 4), hand(-6)], "Players 1, 2 tie with 6, 6!"),
+])
+def test_winner_text(hands, text):
+    assert engine.winner_text(hands) == text
+
+
+def test_hand_totals_follow_moves():
+    cards = hand(10, -4, 0)
+    held = engine.Hand(cards)
+    assert (held.total, held.sylops, held.score) == (6, 1, 6)
+    held.remove(card(10))
+    held.append(card(4, 1))
+    assert (held.total, held.score) == (0, SABACC)
+    held.append(card(0, 1))
+    assert held.score == PURE_SABACC
+
+
+def play_randomly(game, rng, steps):
+    # Random turns, shifts, resets and direct card moves, as the window and bots make them
+    for _ in range(steps):
+        choice = rng.random()
+        if game.is_over or choice < 0.02:
+            game.reset()
+        elif choice < 0.1:
+            game.deal()
+        elif choice < 0.15:
+            die = rng.randint(1, 6)
+            game.resolve_roll(die, die)
+        elif choice < 0.2 and game.deck:
+            game.move_to_hand(game.draw(), rng.randrange(game.num_players))
+        else:
+            game.play(rng.choice(game.legal_actions()))
+
+
+def short_deck(game):
+    # Leaves fewer cards in the deck than the hands hold, so the next shift reshuffles
+    game.deal()
+    while len(game.deck) >= sum(len(hand) for hand in game.hands):
+        game.discard_card(game.draw())
+
+
+def test_snapshot_round_trip():
+    game = engine.Game(seed=3)
+    play_randomly(game, random.Random(3), 300)
+    data = game.snapshot()
+    restored = engine.Game.from_snapshot(data)
+    assert restored.snapshot() == data
+    assert restored.location == game.location
+    assert [hand.total for hand in restored.hands] == [hand.total for hand in game.hands]
+    other = engine.Game(seed=4)
+    other.restore(data)
+    assert other.snapshot() == data
+
+
+def test_snapshot_rejects_other_formats():
+    data = bytearray(engine.Game(seed=1).snapshot())
+    data[0] += 1
+    with pytest.raises(ValueError):
+        engine.Game.from_snapshot(bytes(data))
+
+
+def table_state(game):
+    # What the log rebuilds: the zones, round, dice and swap state, not whose turn it is
+    return protocol.encode_state(game)
+
+
+def test_replay_matches_live_game():
+    rng = random.Random(7)
+    log = eventlog.EventLog()
+    game = engine.Game(seed=7, log=log)
+    checkpoints = {len(log): table_state(game)}
+    for _ in range(400):
+        play_randomly(game, rng, 1)
+        checkpoints[len(log)] = table_state(game)
+    short_deck(game)
+    game.resolve_roll(2, 2)
+    checkpoints[len(log)] = table_state(game)
+    for stop, state in checkpoints.items():
+        assert table_state(eventlog.replay(log, stop)) == state
+
+
+def test_replay_from_snapshot_and_saved_log(tmp_path):
+    base = engine.Game(seed=11)
+    play_randomly(base, random.Random(11), 50)
+    log = eventlog.EventLog(base=base.snapshot())
+    game = engine.Game.from_snapshot(log.base, seed=12, log=log)
+    short_deck(game)
+    game.resolve_roll(5, 5)
+    play_randomly(game, random.Random(12), 200)
+    loaded = eventlog.EventLog.load(log.save(tmp_path / "events.log"))
+    assert loaded.data == log.data and loaded.base == log.base
+    assert table_state(eventlog.replay(loaded)) == table_state(game)
+
+
+def test_unlogged_games_keep_independent_decks():
+    game = engine.Game(seed=5)
+    decks = set()
+    for _ in range(2000):
+        game.reset()
+        decks.add(bytes(game.deck))
+    assert len(decks) == 2000
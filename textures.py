@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import engine
+from profiler import PROFILER
+
+# arcade is imported on first use, so headless code that only needs the asset paths
+# doesn't pay for the GUI stack.
+
+# Asset paths
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(CURRENT_DIR, "..", "assets")
+CARD_BACK_IMAGE = os.path.join(ASSETS_DIR, "cards", "Back.png")
+BACKGROUND_IMAGE = os.path.join(ASSETS_DIR, "background.png")
+DICE_IMAGE_DIR = os.path.join(ASSETS_DIR, "dice")
+DICE_IMAGES = [
+    os.path.join(DICE_IMAGE_DIR, f"Spike Die {i+1} Holo.png") for i in range(6)
+]
+
+# Card images are also kept shrunk to these fractions of full size, built once and cached on
+# disk in CACHE_DIR. Cards are drawn from the smallest level that is still at least their
+# on-screen size, so small cards are sharper and cheaper to fill than a scaled-down original.
+CARD_LEVELS = (0.5, 0.25, 0.125)
+CACHE_DIR = os.path.join(CURRENT_DIR, ".texture_cache")
+
+# PNG decoding runs on these threads; textures are handed to the GPU on the main thread
+LOADER_THREADS = min(8, os.cpu_count() or 1)
+
+# Every image is decoded once and kept here, keyed by path
+_textures = {}
+# Background loads not collected yet, keyed by path
+_pending = {}
+_executor = None
+# Cached level path -> (original path, level), for building levels on first load
+_level_sources = {}
+
+
+def level_for(scale):
+    for level in reversed(CARD_LEVELS):
+        if level >= scale:
+            return level
+    return 1.0
+
+
+def level_path(path, level):
+    # Where the image shrunk to level is cached; level 1.0 is the original
+    if level == 1.0:
+        return path
+    name, _ = os.path.splitext(os.path.basename(path))
+    cached = os.path.join(CACHE_DIR, f"{name}@{level:g}.png")
+    _level_sources[cached] = (path, level)
+    return cached
+
+
+def build_level(path, level):
+    # Writes the shrunk image unless the cached one is at least as new as the original
+    from PIL import Image
+
+    cached = level_path(path, level)
+    if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+        return cached
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with Image.open(path) as image:
+        size = (max(1, round(image.width * level)), max(1, round(image.height * level)))
+        shrunk = image.convert("RGBA").resize(size, Image.LANCZOS)
+    # Saved beside the cache entry and swapped in, so loader threads never see half a file
+    temp_path = f"{cached}.{os.getpid()}.{threading.get_ident()}.tmp"
+    shrunk.save(temp_path, format="PNG")
+    os.replace(temp_path, cached)
+    return cached
+
+
+def card_filename(card, level=1.0):
+    return level_path(os.path.join(ASSETS_DIR, "cards", f"{engine.card_name(card)}.png"), level)
+
+
+def _load(path):
+    # Returns (texture, start, end); the profiler is only touched on the main thread,
+    # so loader threads hand their timings back with the texture
+    import arcade
+
+    start = time.perf_counter()
+    source = _level_sources.get(path)
+    if source is not None:
+        build_level(*source)
+    texture = arcade.load_texture(path)
+    return texture, start, time.perf_counter()
+
+
+def get_texture(path):
+    # Blocks until the texture is decoded, waiting on a background load if one is running
+    texture = _textures.get(path)
+    if texture is None:
+        future = _pending.pop(path, None)
+        texture, start, end = future.result() if future is not None else _load(path)
+        PROFILER.record("texture_load", start, end)
+        _textures[path] = texture
+    return texture
+
+
+def load_async(paths):
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(LOADER_THREADS, thread_name_prefix="texture-loader")
+    for path in paths:
+        if path not in _textures and path not in _pending:
+            _pending[path] = _executor.submit(_load, path)
+
+
+def ready_texture(path):
+    # The texture if it has been decoded, else None without waiting
+    texture = _textures.get(path)
+    if texture is None:
+        future = _pending.get(path)
+        if future is not None and future.done():
+            texture = get_texture(path)
+    return texture
+
+
+def pending_count():
+    return len(_pending)
+
+
+def back_texture(level=1.0):
+    return get_texture(level_path(CARD_BACK_IMAGE, level))
+
+
+def dice_texture(face):
+    return get_texture(DICE_IMAGES[face - 1])
+
+
+def dice_faces():
+    # Face n is at index n - 1
+    return [dice_texture(face) for face in range(1, 7)]
+
+
+def startup_paths(cards, level=1.0):
+    # Everything the table shows besides the card back, in the order it is needed
+    paths = [card_filename(card, level) for card in cards] + DICE_IMAGES
+    if os.path.exists(BACKGROUND_IMAGE):
+        paths.insert(0, BACKGROUND_IMAGE)
+    return paths
@@ -0,0 +1,110 @@
+import argparse
+import math
+import multiprocessing
+import time
+
+import mcts  # noqa: F401 registers the "mcts" strategy
+import strategies
+
+# Plays many full games between bot strategies across a process pool.
+# Game i always uses seed base_seed * GAMES_PER_SEED + i and seat rotation i % players,
+# so results are the same whatever the number of workers or the chunk size.
+
+GAMES_PER_SEED = 1 << 32
+CHUNK_SIZE = 2000
+Z_95 = 1.959964
+
+
+def play_chunk(args):
+    names, base_seed, start, count = args
+    funcs = [strategies.get_strategy(name) for name in names]
+    n = len(names)
+    wins = [0] * n
+    ties = [0] * n
+    for i in range(start, start + count):
+        # Rotate seats so no strategy always acts first
+        seats = [(s + i) % n for s in range(n)]
+        _, winners = strategies.play_game([funcs[s] for s in seats], seed=base_seed * GAMES_PER_SEED + i)
+        for seat in winners:
+            if len(winners) == 1:
+                wins[seats[seat]] += 1
+            else:
+                ties[seats[seat]] += 1
+    return count, wins, ties
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    if trials == 0:
+        return 0.0, 0.0
+    p = successes / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return center - half, center + half
+
+
+def run_tournament(names, n_games, workers=None, seed=0, chunk_size=CHUNK_SIZE, progress=None):
+    # Chunks are streamed back as they finish; progress(results) sees the running totals
+    for name in names:
+        strategies.get_strategy(name)
+    chunks = [(names, seed, start, min(chunk_size, n_games - start)) for start in range(0, n_games, chunk_size)]
+    n = len(names)
+    played = 0
+    wins = [0] * n
+    ties = [0] * n
+    started = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        for count, chunk_wins, chunk_ties in pool.imap_unordered(play_chunk, chunks):
+            played += count
+            for s in range(n):
+                wins[s] += chunk_wins[s]
+                ties[s] += chunk_ties[s]
+            if progress is not None:
+                progress(summarize(names, played, wins, ties, time.perf_counter() - started))
+    return summarize(names, played, wins, ties, time.perf_counter() - started)
+
+
+def summarize(names, played, wins, ties, elapsed):
+    return {
+        "games": played,
+        "seconds": elapsed,
+        "games_per_second": played / elapsed if elapsed else 0.0,
+        "strategies": [
+            {
+                "name": name,
+                "wins": wins[s],
+                "ties": ties[s],
+                "win_rate": wins[s] / played if played else 0.0,
+                "win_rate_ci": wilson_interval(wins[s], played),
+                "tie_rate": ties[s] / played if played else 0.0,
+            }
+            for s, name in enumerate(names)
+        ],
+    }
+
+
+def print_results(results):
+    print(f"{results['games']} games in {results['seconds']:.2f}s ({results['games_per_second']:.0f} games/s)")
+    print("Seat  Strategy    Win rate  95% CI             Tie rate")
+    for s, row in enumerate(results["strategies"]):
+        low, high = row["win_rate_ci"]
+        print(f"{s + 1:>4}  {row['name']:<10}  {row['win_rate']:>8.4f}  [{low:.4f}, {high:.4f}]  {row['tie_rate']:>8.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play bot strategies against each other.")
+    parser.add_argument("games", type=int, nargs="?", default=10000)
+    parser.add_argument("strategies", nargs="*", default=["greedy", "random", "stand", "random"],
+                        help=f"one per seat, from: {', '.join(strategies.STRATEGIES)}")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        results = run_tournament(args.strategies, args.games, args.workers, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
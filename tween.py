@@ -0,0 +1,85 @@
+import numpy as np
+
+# Time-based tweens for sprites flying across the table. Positions of every active tween
+# are computed in one vectorized step from elapsed time, so motion does not depend on the
+# frame rate and any number of cards can be in the air at once.
+
+# A full deal takes the same wall-clock time however many cards are dealt
+DEAL_DURATION = 0.9
+DEAL_FLIGHT = 0.35
+DEAL_SPIN = 25
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+def stagger(count, total=DEAL_DURATION, flight=DEAL_FLIGHT):
+    # Start delays that spread count flights over total seconds
+    if count <= 1:
+        return np.zeros(count)
+    return np.linspace(0, max(total - flight, 0), count)
+
+
+class TweenGroup:
+    def __init__(self, easing=ease_out_cubic, on_land=None):
+        self.easing = easing
+        self.on_land = on_land
+        self.clear()
+
+    def clear(self):
+        self.clock = 0.0
+        self.sprites = []
+        self.start = np.zeros((0, 2))
+        self.end = np.zeros((0, 2))
+        self.begin = np.zeros(0)
+        self.duration = np.ones(0)
+        self.spin = np.zeros(0)
+        self.done = np.zeros(0, dtype=bool)
+        # Tweens before head have all landed; advancing it is the O(1) dequeue
+        self.head = 0
+
+    @property
+    def active(self):
+        return self.head < len(self.sprites)
+
+    def add_many(self, sprites, targets, delays, duration=DEAL_FLIGHT, spins=0):
+        # Each sprite flies from where it is now to its (x, y) target after its delay
+        count = len(sprites)
+        if not count:
+            return
+        if not self.active:
+            self.clear()
+        self.sprites.extend(sprites)
+        start = np.array([(sprite.center_x, sprite.center_y) for sprite in sprites], dtype=float)
+        self.start = np.concatenate((self.start, start))
+        self.end = np.concatenate((self.end, np.asarray(targets, dtype=float).reshape(count, 2)))
+        self.begin = np.concatenate((self.begin, self.clock + np.asarray(delays, dtype=float)))
+        self.duration = np.concatenate((self.duration, np.broadcast_to(np.asarray(duration, dtype=float), count)))
+        self.spin = np.concatenate((self.spin, np.broadcast_to(np.asarray(spins, dtype=float), count)))
+        self.done = np.concatenate((self.done, np.zeros(count, dtype=bool)))
+
+    def update(self, delta_time):
+        if not self.active:
+            return
+        self.clock += delta_time
+        head = self.head
+        t = np.clip((self.clock - self.begin[head:]) / self.duration[head:], 0.0, 1.0)
+        eased = self.easing(t)
+        position = self.start[head:] + (self.end[head:] - self.start[head:]) * eased[:, None]
+        # Cards tilt on the way and come down flat
+        angle = self.spin[head:] * np.sin(np.pi * eased)
+        moving = np.flatnonzero((t > 0) & ~self.done[head:])
+        for i in moving.tolist():
+            sprite = self.sprites[head + i]
+            sprite.center_x, sprite.center_y = position[i]
+            sprite.angle = angle[i]
+        landed = moving[t[moving] >= 1.0]
+        for i in landed.tolist():
+            self.done[head + i] = True
+            sprite = self.sprites[head + i]
+            sprite.angle = 0
+            if self.on_land is not None:
+                self.on_land(sprite)
+        while self.head < len(self.sprites) and self.done[self.head]:
+            self.head += 1